@@ -1,14 +1,17 @@
 import os
+import re
 import json
-import shutil
+import asyncio
 import subprocess
 import sys
 import glob
 import logging
 from pathlib import Path
-from fastapi import FastAPI, UploadFile, File
+from functools import lru_cache
+from fastapi import FastAPI, UploadFile, File, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from final_facial_embedding import run_match_array, decode_image
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -23,9 +26,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-TEMP_INPUT = "uploaded_input.jpg"
-OUTPUT_JSON = "top_matches.json"
-
 
 class ProfileRequest(BaseModel):
     profile_url: str
@@ -33,21 +33,16 @@ class ProfileRequest(BaseModel):
 
 @app.post("/match")
 async def match(file: UploadFile = File(...)):
-    with open(TEMP_INPUT, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    process = subprocess.Popen(
-        [sys.executable, "final_facial_embedding.py", TEMP_INPUT],
-        stdout=sys.stdout,
-        stderr=sys.stderr
-    )
-    process.wait()
-
-    if not os.path.exists(OUTPUT_JSON):
+    # Decode the upload in memory; nothing is written to disk
+    data = await file.read()
+    img = decode_image(data)
+    if img is None:
         return {"success": False, "results": []}
 
-    with open(OUTPUT_JSON, "r") as f:
-        raw = json.load(f)
+    # Run in-process on a worker thread so the face model stays loaded between requests
+    raw = await asyncio.to_thread(run_match_array, img)
+    if raw is None:
+        return {"success": False, "results": []}
 
     formatted = []
     for r in raw:
@@ -63,6 +58,15 @@ async def match(file: UploadFile = File(...)):
     return {"success": True, "results": formatted}
 
 
+# Strong references to the reaper tasks: the event loop only keeps weak ones
+_reaper_tasks = set()
+
+
+async def _reap_scraper(process: asyncio.subprocess.Process, profile_url: str):
+    returncode = await process.wait()
+    logger.info(f"🏁 Scraping process {process.pid} for {profile_url} exited with code {returncode}")
+
+
 @app.post("/scrape-profile")
 async def scrape_profile(req: ProfileRequest):
     """Start LinkedIn scraping process and return immediately."""
@@ -81,11 +85,19 @@ async def scrape_profile(req: ProfileRequest):
         # Start the scraping process in the background (detached)
         logger.info(f"🚀 Starting LinkedIn scrape for: {req.profile_url}")
         
-        # Use subprocess.Popen exactly like when running manually
-        process = subprocess.Popen(
-            [sys.executable, "final_scrape_summary.py", req.profile_url],
-            cwd="."
-        )
+        # Fire-and-forget child that does not inherit the server's stdout;
+        # the scraper keeps its own log file under BASE_OUTPUT_DIR/logs
+        cmd = [sys.executable, "final_scrape_summary.py", req.profile_url]
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd, cwd=".", stdout=asyncio.subprocess.DEVNULL
+            )
+            task = asyncio.create_task(_reap_scraper(process, req.profile_url))
+            _reaper_tasks.add(task)
+            task.add_done_callback(_reaper_tasks.discard)
+        except NotImplementedError:
+            # Selector event loops on Windows cannot spawn async subprocesses
+            process = subprocess.Popen(cmd, cwd=".", stdout=subprocess.DEVNULL)
         
         logger.info(f"✅ Scraping process started with PID: {process.pid} for URL: {req.profile_url}")
         
@@ -104,6 +116,68 @@ async def scrape_profile(req: ProfileRequest):
         }
 
 
+@lru_cache(maxsize=1024)
+def _match_profile_folders(profile_name: str, current_dir: str, dir_mtime_ns: int):
+    """
+    Result folders whose names match profile_name, plus every directory name (for the not-found
+    message). Cached per directory mtime: a new or removed result folder changes it, so repeated
+    status polls for the same name skip the directory walk.
+    """
+    # One directory read; DirEntry caches is_dir()/stat() results
+    with os.scandir(current_dir) as it:
+        all_dir_entries = [e for e in it if e.is_dir()]
+
+    # Get all directories that look like profile folders (contain timestamps)
+    all_profile_folders = [e for e in all_dir_entries if e.name.count("_") >= 2]
+
+    # Filter folders that contain any part of the profile name
+    name_parts = profile_name.lower().replace("_", " ").split()
+
+    # One compiled pattern per significant name part, covering known spelling variants
+    part_patterns = [
+        re.compile("|".join(re.escape(v) for v in {
+            part,
+            part.replace("rajgopal", "rajagopal"),
+            part.replace("rajagopal", "rajgopal"),
+        }))
+        for part in name_parts if len(part) > 2
+    ]
+    min_matches = max(len(name_parts) // 2, 1)
+
+    matching_folders = []
+    for folder in all_profile_folders:
+        folder_name_lower = folder.name.lower()
+        # Count the name parts found in the folder name
+        matches = sum(1 for pattern in part_patterns if pattern.search(folder_name_lower))
+
+        # If at least half the name parts match, consider it a match
+        if matches >= min_matches:
+            matching_folders.append(folder.path)
+
+    return tuple(matching_folders), tuple(e.name for e in all_dir_entries), tuple(name_parts)
+
+
+@lru_cache(maxsize=256)
+def _load_summary(summary_path: str, mtime_ns: int) -> bytes:
+    """
+    final_summary.json as strict JSON bytes, validated once and re-read only when the file changes.
+    Raises on a partially written file. NaN/Infinity literals are not valid JSON, so a file that
+    contains them is re-serialised with null in their place instead of being passed through.
+    """
+    with open(summary_path, "rb") as f:
+        raw = f.read()
+    constants = []
+
+    def to_null(name):
+        constants.append(name)
+        return None
+
+    summary = json.loads(raw, parse_constant=to_null)
+    if constants:
+        return json.dumps(summary, ensure_ascii=False).encode("utf-8")
+    return raw
+
+
 @app.get("/scrape-status/{profile_name}")
 async def get_scrape_status(profile_name: str):
     """Check if scraping results are available for a profile."""
@@ -112,52 +186,32 @@ async def get_scrape_status(profile_name: str):
         current_dir = Path(__file__).parent  # Use the directory where api.py is located
         logger.info(f"🔍 Searching in directory: {current_dir}")
         logger.info(f"🔍 Looking for profile: {profile_name}")
-        
-        # Clean profile name for folder matching (remove spaces, etc.)
-        clean_name = profile_name.replace(" ", "_")
-        
-        # Try a comprehensive search approach
-        matching_folders = []
-        
-        # Get all directories that look like profile folders (contain timestamps)
-        all_profile_folders = list(current_dir.glob("*_*_*"))
-        
-        # Filter folders that contain any part of the profile name
-        name_parts = profile_name.lower().replace("_", " ").split()
-        
-        for folder in all_profile_folders:
-            folder_name_lower = folder.name.lower()
-            # Check if folder contains all significant name parts
-            matches = 0
-            for part in name_parts:
-                if len(part) > 2 and (part in folder_name_lower or part.replace("rajgopal", "rajagopal") in folder_name_lower or part.replace("rajagopal", "rajgopal") in folder_name_lower):
-                    matches += 1
-            
-            # If at least half the name parts match, consider it a match
-            if matches >= len(name_parts) // 2 and matches > 0:
-                matching_folders.append(folder)
-        
-        logger.info(f"🔍 Found {len(matching_folders)} matching folders: {[f.name for f in matching_folders]}")
-        
+
+        matching_folders, all_dirs, name_parts = _match_profile_folders(
+            profile_name, str(current_dir), os.stat(current_dir).st_mtime_ns)
+
+        logger.info(f"🔍 Found {len(matching_folders)} matching folders: {[os.path.basename(f) for f in matching_folders]}")
+
         if not matching_folders:
             # List all directories for debugging
-            all_dirs = [d.name for d in current_dir.iterdir() if d.is_dir()]
             return {
                 "success": False,
                 "status": "not_found", 
                 "message": f"No scraping results found for {profile_name}",
-                "name_parts_searched": name_parts,
-                "available_directories": all_dirs,
+                "name_parts_searched": list(name_parts),
+                "available_directories": list(all_dirs),
                 "search_directory": str(current_dir)
             }
             
-        # Use the most recent folder
-        latest_folder = max(matching_folders, key=lambda p: p.stat().st_mtime)
+        # Use the most recent folder (stat'ed per request: writing results inside a folder updates its mtime)
+        latest_folder = Path(max(matching_folders, key=lambda f: os.stat(f).st_mtime))
         
         summary_file = latest_folder / "final_summary.json"
         activity_file = latest_folder / "activity_posts.json"
         
-        if not summary_file.exists():
+        try:
+            summary_mtime_ns = os.stat(summary_file).st_mtime_ns
+        except FileNotFoundError:
             return {
                 "success": False,
                 "status": "in_progress",
@@ -165,17 +219,21 @@ async def get_scrape_status(profile_name: str):
             }
             
         # Load results (only final_summary.json)
-        with open(summary_file, "r", encoding="utf-8") as f:
-            summary = json.load(f)
-        
-        return {
-            "success": True,
-            "status": "completed",
-            "profile_name": profile_name,
-            "summary": summary,
-            "output_folder": str(latest_folder),
-            "message": f"Scraping completed for {profile_name}"
-        }
+        summary = _load_summary(str(summary_file), summary_mtime_ns)
+        
+        # Splice the file bytes into the envelope instead of round-tripping them through jsonable_encoder
+        content = b"".join((
+            b'{"success": true, "status": "completed", "profile_name": ',
+            json.dumps(profile_name).encode(),
+            b', "summary": ',
+            summary,
+            b', "output_folder": ',
+            json.dumps(str(latest_folder)).encode(),
+            b', "message": ',
+            json.dumps(f"Scraping completed for {profile_name}").encode(),
+            b"}",
+        ))
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         return {
@@ -0,0 +1,159 @@
+import os
+import sys
+import pickle
+import asyncio
+import hashlib
+import logging
+import httpx
+import diskcache
+import numpy as np
+from tqdm.asyncio import tqdm_asyncio
+from typing import List, Dict, Any, Optional
+
+from final_facial_embedding import (
+    BASE_DIR,
+    FACE_MODEL_NAME,
+    GALLERY_PATH,
+    GALLERY_META_PATH,
+    GALLERY_INDEX_PATH,
+    ANN_MIN_GALLERY_SIZE,
+    hnswlib,
+    get_app,
+    decode_image,
+    _embed_from_array,
+    load_profiles,
+)
+
+# =========================================
+# GALLERY BUILDER
+# =========================================
+# Downloads every LinkedIn profile picture in profiles.json once, embeds it
+# and stores the whole gallery as a single (N, 512) float32 matrix so that
+# /match only has to run one matrix-vector product per request.
+
+# float16 halves the gallery's size and the bandwidth of the ranking matmul;
+# float32 stays the default since NumPy has no BLAS half-precision GEMV
+GALLERY_DTYPE = os.getenv("GALLERY_DTYPE", "float32")
+
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+HTTP_TIMEOUT = 10
+HTTP_RETRIES = 3
+
+# Embeddings keyed by model name + sha256 of the image bytes, so unchanged
+# pictures are not re-embedded on the next build. b"" marks "no usable face".
+EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, "emb_cache")
+
+
+def profile_image_url(profile: Dict[str, Any]) -> Optional[str]:
+    pic_data = profile.get("profilePicture", {}).get("displayImage~", {}).get("elements", [])
+    if not pic_data:
+        return None
+    return pic_data[0].get("identifiers", [{}])[0].get("identifier")
+
+
+def profile_columns(profiles: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Flatten the nested LinkedIn export into parallel columns (one row per profile with a picture)."""
+    columns: Dict[str, List[str]] = {"names": [], "profiles": [], "pic_urls": []}
+    for p in profiles:
+        url = profile_image_url(p)
+        if not url:
+            continue
+        columns["names"].append(f"{p.get('localizedFirstName','')} {p.get('localizedLastName','')}".strip())
+        columns["profiles"].append(p.get("publicProfileUrl", ""))
+        columns["pic_urls"].append(url)
+    return columns
+
+
+def _decode_embed(app, cache: diskcache.Cache, content: bytes, url: str) -> Optional[np.ndarray]:
+    key = f"{FACE_MODEL_NAME}:{hashlib.sha256(content).hexdigest()}"
+    cached = cache.get(key)
+    if cached is not None:
+        return np.frombuffer(cached, dtype=np.float32) if cached else None
+
+    # Decode straight from the response bytes; no temp file round trip
+    img = decode_image(content)
+    if img is None:
+        return None
+    emb = _embed_from_array(app, img, url)
+    cache.set(key, emb.tobytes() if emb is not None else b"")
+    return emb
+
+
+async def download_embed(client: httpx.AsyncClient, app, cache: diskcache.Cache, url: str) -> Optional[np.ndarray]:
+    try:
+        r = await client.get(url)
+        if r.status_code != 200:
+            return None
+
+        # Inference is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(_decode_embed, app, cache, r.content, url)
+    except:
+        return None
+
+
+async def embed_all(app, urls: List[str]) -> List[Optional[np.ndarray]]:
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES)
+    with diskcache.Cache(EMBEDDING_CACHE_DIR) as cache:
+        async with httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT) as client:
+            return await tqdm_asyncio.gather(
+                *[download_embed(client, app, cache, url) for url in urls],
+                desc="🖼 Embedding gallery"
+            )
+
+
+def build_index(gallery: np.ndarray) -> None:
+    """Write an HNSW index for large galleries; drop any stale one otherwise."""
+    if os.path.exists(GALLERY_INDEX_PATH):
+        os.remove(GALLERY_INDEX_PATH)
+    if len(gallery) < ANN_MIN_GALLERY_SIZE:
+        return
+    if hnswlib is None:
+        logging.warning("⚠ hnswlib not installed; /match will use exact search")
+        return
+
+    index = hnswlib.Index(space="cosine", dim=gallery.shape[1])
+    index.init_index(max_elements=len(gallery), ef_construction=200, M=32)
+    index.add_items(gallery, np.arange(len(gallery)))
+    tmp_path = GALLERY_INDEX_PATH + ".tmp"
+    index.save_index(tmp_path)
+    os.replace(tmp_path, GALLERY_INDEX_PATH)
+    logging.info(f"💾 Saved HNSW index to {GALLERY_INDEX_PATH}")
+
+
+def build_gallery() -> int:
+    profiles = load_profiles()
+    if not profiles:
+        logging.error("❌ No profiles found.")
+        return 0
+
+    columns = profile_columns(profiles)
+    app = get_app()
+    embeddings = asyncio.run(embed_all(app, columns["pic_urls"]))
+
+    rows = [i for i, emb in enumerate(embeddings) if emb is not None]
+    if not rows:
+        logging.error("❌ No gallery embeddings could be computed.")
+        return 0
+
+    gallery = np.stack([embeddings[i] for i in rows]).astype(np.float32)
+    gallery /= np.linalg.norm(gallery, axis=1, keepdims=True)
+    # Written to temp files and swapped in: a running API memory-maps the gallery,
+    # and truncating a mapped file in place would crash it (SIGBUS)
+    with open(GALLERY_PATH + ".tmp", "wb") as f:
+        np.save(f, gallery.astype(GALLERY_DTYPE))
+    # Metadata is stored column-wise, aligned with the gallery rows
+    with open(GALLERY_META_PATH + ".tmp", "wb") as f:
+        pickle.dump({
+            "names": [columns["names"][i] for i in rows],
+            "profiles": [columns["profiles"][i] for i in rows],
+        }, f)
+    os.replace(GALLERY_PATH + ".tmp", GALLERY_PATH)
+    os.replace(GALLERY_META_PATH + ".tmp", GALLERY_META_PATH)
+
+    logging.info(f"💾 Saved {len(rows)} embeddings to {GALLERY_PATH}")
+    build_index(gallery)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_gallery() else 1)
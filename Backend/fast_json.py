@@ -0,0 +1,16 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(raw: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity literals, which orjson rejects and stdlib json accepts
+    return json.loads(raw)
@@ -5,16 +5,38 @@ import numpy as np
 import sys
 import time
 import logging
-import requests
 import re
-from tqdm import tqdm
-from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import pickle
+from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
-from sklearn.metrics.pairwise import cosine_similarity
+import onnxruntime as ort
 from insightface.app import FaceAnalysis
-from requests.adapters import HTTPAdapter, Retry
-import shutil
+from functools import lru_cache
+from fast_json import json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbojpeg = TurboJPEG()
+except Exception:  # package or the libjpeg-turbo shared library missing
+    _turbojpeg = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
 
 # =========================================
 # CONFIGURATION
@@ -28,10 +50,25 @@ PROFILES_PATH = os.path.join(BASE_DIR, "profiles.json")
 COOKIES_PATH = os.path.join(BASE_DIR, "cookies.json")
 OUTPUT_JSON = os.path.join(BASE_DIR, "top_matches.json")
 TEMP_DIR = os.path.join(BASE_DIR, "temp_photos")
+GALLERY_PATH = os.path.join(BASE_DIR, "gallery.npy")
+GALLERY_META_PATH = os.path.join(BASE_DIR, "gallery_meta.pkl")
+GALLERY_INDEX_PATH = os.path.join(BASE_DIR, "gallery.hnsw")
+
+# Set to "buffalo_l_int8" after running quantize_model.py to use the INT8 recognition model
+FACE_MODEL_NAME = os.getenv("FACE_MODEL_NAME", "buffalo_l")
+
+# Accelerated ONNX Runtime providers in order of preference; CPU is always the fallback
+PREFERRED_PROVIDERS = ["CUDAExecutionProvider", "OpenVINOExecutionProvider", "DnnlExecutionProvider"]
+
+DET_SIZE = (640, 640)
 
 SIMILARITY_THRESHOLD = 0.35
+TOP_K = 4
+# Galleries at least this large get an HNSW index; smaller ones are scanned exactly
+ANN_MIN_GALLERY_SIZE = 5000
+# Neighbours fetched from the index before exact re-scoring
+ANN_CANDIDATES = 32
 DETECTION_SCORE_THRESHOLD = 0.5
-MAX_WORKERS = 5
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,19 +79,25 @@ logging.basicConfig(
 # =========================================
 # UTILS
 # =========================================
+def json_dump_bytes(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 def load_profiles() -> List[Dict[str, Any]]:
     if not os.path.exists(PROFILES_PATH):
         logging.error("❌ profiles.json not found.")
         return []
 
     try:
-        with open(PROFILES_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(PROFILES_PATH, "rb") as f:
+            data = json_loads(f.read())
 
+        # Accept both the raw list and format.py's {"elements": [...]} wrapper
+        # without rewriting the file on load
         if isinstance(data, dict) and "elements" in data:
             data = data["elements"]
-            with open(PROFILES_PATH, "w", encoding="utf-8") as f2:
-                json.dump(data, f2, indent=2)
 
         return data
     except:
@@ -62,143 +105,279 @@ def load_profiles() -> List[Dict[str, Any]]:
         return []
 
 
-def create_session() -> requests.Session:
-    session = requests.Session()
-    retries = Retry(total=3, backoff_factor=1)
-    adapter = HTTPAdapter(max_retries=retries)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+# Gallery: (N, 512) L2-normalised float32 (or float16) matrix built offline by
+# build_gallery.py, plus {"names": [...], "profiles": [...]} columns aligned
+# with its rows.
+# The matrix is memory-mapped read-only, so every Uvicorn worker reads the
+# same page-cache copy instead of holding a private one; never copy it.
+# Both caches are keyed on the files' mtimes, so a rebuild by build_gallery.py
+# (which swaps the files in atomically) is picked up without restarting the API.
+_GALLERY: Optional[Tuple[np.ndarray, Dict[str, List[str]]]] = None
+_GALLERY_KEY = None
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_gallery() -> Optional[Tuple[np.ndarray, Dict[str, List[str]]]]:
+    global _GALLERY, _GALLERY_KEY
+    key = (_mtime_ns(GALLERY_PATH), _mtime_ns(GALLERY_META_PATH))
+    if _GALLERY is not None and key == _GALLERY_KEY:
+        return _GALLERY
+    if None in key:
+        return None
+    try:
+        gallery = np.load(GALLERY_PATH, mmap_mode="r")
+        with open(GALLERY_META_PATH, "rb") as f:
+            meta = pickle.load(f)
+        if isinstance(meta, list):
+            # Row-wise metadata written by older build_gallery.py versions
+            meta = {"names": [m["name"] for m in meta], "profiles": [m["profile"] for m in meta]}
+        if len(meta["names"]) != len(gallery):
+            # Caught between build_gallery.py's two swaps; retried on the next call
+            logging.warning("⚠ Gallery and metadata sizes differ (rebuild in progress?); keeping the loaded gallery")
+            return _GALLERY
+        _GALLERY, _GALLERY_KEY = (gallery, meta), key
+        logging.info(f"📦 Loaded gallery with {len(meta['names'])} embeddings")
+        return _GALLERY
+    except Exception as e:
+        logging.error(f"❌ Failed to load gallery: {e}")
+        return None
+
+
+_GALLERY_INDEX = None
+_GALLERY_INDEX_KEY = None
+
+
+def load_gallery_index(num_rows: int, dim: int):
+    """Load the HNSW index written by build_gallery.py, if there is one."""
+    global _GALLERY_INDEX, _GALLERY_INDEX_KEY
+    if hnswlib is None:
+        return None
+    key = (_mtime_ns(GALLERY_INDEX_PATH), num_rows, dim)
+    if key == _GALLERY_INDEX_KEY:
+        return _GALLERY_INDEX
+    _GALLERY_INDEX, _GALLERY_INDEX_KEY = None, key
+    if key[0] is None:
+        return None
+    try:
+        index = hnswlib.Index(space="cosine", dim=dim)
+        index.load_index(GALLERY_INDEX_PATH, max_elements=num_rows)
+        index.set_ef(max(64, ANN_CANDIDATES))
+        _GALLERY_INDEX = index
+        logging.info("📦 Loaded HNSW gallery index")
+    except Exception as e:
+        logging.warning(f"⚠ Could not load gallery index, using exact search: {e}")
+    return _GALLERY_INDEX
 
 
 # =========================================
 # FACE MODEL
 # =========================================
-def init_face_model() -> FaceAnalysis:
-    app = FaceAnalysis(name="buffalo_l")
-    app.prepare(ctx_id=-1, det_size=(640, 640))  # CPU MODE (important fix)
+def select_providers() -> List[str]:
+    available = ort.get_available_providers()
+    return [p for p in PREFERRED_PROVIDERS if p in available] + ["CPUExecutionProvider"]
+
+
+def init_face_model(model_name: str = FACE_MODEL_NAME) -> FaceAnalysis:
+    providers = select_providers()
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.intra_op_num_threads = os.cpu_count() or 0
+    # Allocate weights exactly rather than through the growing arena to keep
+    # per-worker RSS down when several workers each hold a session
+    sess_options.add_session_config_entry("session.use_device_allocator_for_initializers", "1")
+    logging.info(f"🧠 ONNX Runtime providers: {providers}")
+
+    app = FaceAnalysis(name=model_name, providers=providers)
+    # FaceAnalysis only forwards providers to its sessions, so rebuild each model's
+    # session from the same file with the tuned options (input/output names are unchanged)
+    for task, model in app.models.items():
+        model.session = ort.InferenceSession(model.model_file, sess_options, providers=providers)
+        opts = model.session.get_session_options()
+        logging.info(f"🧠 {task} session: intra_op_num_threads={opts.intra_op_num_threads}, "
+                     f"graph_optimization_level={opts.graph_optimization_level}")
+    # insightface forces CPUExecutionProvider when ctx_id < 0, so only use it
+    # when no accelerated provider is available
+    ctx_id = 0 if len(providers) > 1 else -1
+    app.prepare(ctx_id=ctx_id, det_size=DET_SIZE)
     return app
 
 
+@lru_cache(maxsize=1)
+def get_app() -> FaceAnalysis:
+    """Process-wide model singleton so the ONNX sessions stay warm."""
+    return init_face_model()
+
+
+def decode_image(data: bytes) -> Optional[np.ndarray]:
+    """Decode image bytes to BGR, using libjpeg-turbo for JPEGs when available."""
+    if _turbojpeg is not None and data[:2] == b"\xff\xd8":
+        try:
+            return _turbojpeg.decode(data, pixel_format=TJPF_BGR)
+        except Exception:
+            pass
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
 def get_face_embedding(app: FaceAnalysis, image_path: str) -> Optional[np.ndarray]:
     img = cv2.imread(image_path)
     if img is None:
         logging.error(f"[ERROR] Cannot read image: {image_path}")
         return None
-
-    faces = app.get(img)
+    return _embed_from_array(app, img, image_path)
+
+
+@njit(cache=True, fastmath=True)
+def _norm_and_score(embs, bboxes, det_scores, thresh):
+    """Pick the largest face with det_score >= thresh and L2-normalise its embedding.
+
+    Returns an empty array when no face qualifies.
+    """
+    best = -1
+    best_area = -1.0
+    for i in range(embs.shape[0]):
+        if det_scores[i] < thresh:
+            continue
+        area = (bboxes[i, 2] - bboxes[i, 0]) * (bboxes[i, 3] - bboxes[i, 1])
+        if area > best_area:
+            best = i
+            best_area = area
+    if best < 0:
+        return np.empty(0, dtype=np.float32)
+    emb = embs[best].astype(np.float32)
+    norm = np.sqrt(np.sum(emb * emb))
+    if norm == 0.0:
+        return np.empty(0, dtype=np.float32)
+    return emb / norm
+
+
+def _fit_to_det_size(img: np.ndarray) -> np.ndarray:
+    """Downscale so the longest side matches the detector input; never upscale."""
+    h, w = img.shape[:2]
+    scale = max(DET_SIZE) / max(h, w)
+    if scale >= 1:
+        return img
+    return cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+def _embed_from_array(app: FaceAnalysis, img: np.ndarray, label: str = "image") -> Optional[np.ndarray]:
+    faces = app.get(_fit_to_det_size(img))
     if not faces:
-        logging.warning(f"⚠ No face detected in {image_path}")
+        logging.warning(f"⚠ No face detected in {label}")
         return None
 
-    faces = [f for f in faces if getattr(f, "det_score", 1.0) >= DETECTION_SCORE_THRESHOLD]
-    if not faces:
-        logging.warning(f"⚠ No high-quality face detected in {image_path}")
+    # Normalised here so cosine similarity is a plain dot product
+    emb = _norm_and_score(
+        np.stack([f.embedding for f in faces]).astype(np.float32),
+        np.stack([f.bbox for f in faces]).astype(np.float32),
+        np.array([getattr(f, "det_score", 1.0) for f in faces], dtype=np.float32),
+        DETECTION_SCORE_THRESHOLD,
+    )
+    if emb.size == 0:
+        logging.warning(f"⚠ No high-quality face detected in {label}")
         return None
-
-    faces.sort(key=lambda x: (x.bbox[2]-x.bbox[0])*(x.bbox[3]-x.bbox[1]), reverse=True)
-    return faces[0].embedding
+    return emb
 
 
 def compute_similarity(emb1: np.ndarray, emb2: np.ndarray) -> float:
-    sim = cosine_similarity([emb1], [emb2])[0][0]
-    return float(sim) if not np.isnan(sim) else 0.0
+    """Cosine similarity of two embeddings returned by get_face_embedding."""
+    return float(np.dot(emb1, emb2))
 
 
 # =========================================
 # MAIN PIPELINE
 # =========================================
-def main() -> None:
-    logging.info("🚀 Face Matching Started")
-
-    # Read image path
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
-    else:
-        image_path = input("Enter the path of the candidate image: ").strip()
-
+def run_match(image_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Match a candidate image file against the LinkedIn gallery."""
     logging.info(f"📸 Processing image: {image_path}")
 
     if not os.path.exists(image_path):
         logging.error(f"❌ Image does NOT exist: {image_path}")
-        return
-
-    profiles = load_profiles()
-    if not profiles:
-        logging.error("❌ No profiles found.")
-        return
-
-    # Init model
-    app = init_face_model()
-    query_emb = get_face_embedding(app, image_path)
-    if query_emb is None:
-        logging.error("❌ No face embedding extracted from input image.")
-        return
-
-    os.makedirs(TEMP_DIR, exist_ok=True)
-    session = create_session()
-    results = []
+        return None
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_map = {}
+    img = cv2.imread(image_path)
+    if img is None:
+        logging.error(f"[ERROR] Cannot read image: {image_path}")
+        return None
+    return run_match_array(img)
 
-        for p in profiles:
-            pic_data = p.get("profilePicture", {}).get("displayImage~", {}).get("elements", [])
-            if not pic_data:
-                continue
 
-            img_url = pic_data[0].get("identifiers", [{}])[0].get("identifier")
-            if not img_url:
-                continue
+def run_match_array(img: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+    """Match a decoded BGR image against the LinkedIn gallery.
 
-            save_path = os.path.join(TEMP_DIR, f"{p.get('localizedFirstName','unknown')}.jpg")
-            future_map[executor.submit(download_compare, session, app, query_emb, img_url, save_path, p)] = p
+    Returns the TOP_K best matches, or None if the query image could not be used.
+    """
+    gallery = load_gallery()
+    if gallery is None:
+        logging.error("❌ Gallery not built. Run `python build_gallery.py` first.")
+        return None
+    gallery_embs, gallery_meta = gallery
+    names, profile_urls = gallery_meta["names"], gallery_meta["profiles"]
 
-        for future in tqdm(as_completed(future_map), total=len(future_map), desc="🔎 Matching"):
-            result = future.result()
-            if result:
-                results.append(result)
+    app = get_app()
+    query_emb = _embed_from_array(app, img, "query image")
+    if query_emb is None:
+        logging.error("❌ No face embedding extracted from input image.")
+        return None
 
-    results = sorted(results, key=lambda x: x["similarity"], reverse=True)
-    results = [r for r in results if r["similarity"] >= SIMILARITY_THRESHOLD][:4]
+    query_emb = query_emb.astype(gallery_embs.dtype, copy=False)
+    index = load_gallery_index(*gallery_embs.shape)
+    if index is not None:
+        # Sublinear candidate search, then exact re-scoring of the few candidates
+        labels, _ = index.knn_query(query_emb, k=min(ANN_CANDIDATES, len(names)))
+        rows = labels[0].astype(np.intp)
+        sims = gallery_embs[rows] @ query_emb
+    else:
+        # One matrix-vector product ranks the whole gallery
+        rows = np.arange(len(names))
+        sims = gallery_embs @ query_emb
+
+    # Only the best TOP_K above the threshold are needed: partition, then sort those few
+    idx = np.flatnonzero(sims >= SIMILARITY_THRESHOLD)
+    if len(idx) > TOP_K:
+        idx = idx[np.argpartition(sims[idx], -TOP_K)[-TOP_K:]]
+    idx = idx[np.argsort(-sims[idx])]
+
+    results = [
+        {
+            "name": names[rows[i]],
+            "profile": profile_urls[rows[i]],
+            "similarity": round(float(sims[i]), 4)
+        }
+        for i in idx
+    ]
 
     logging.info(f"📝 Final Matches: {results}")
-
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
-
-    logging.info(f"💾 Saved to {OUTPUT_JSON}")
-
-    shutil.rmtree(TEMP_DIR, ignore_errors=True)
-    logging.info("🧹 Temp cleaned")
+    return results
 
 
-def download_compare(session, app, query_emb, url, save_path, profile):
-    try:
-        r = session.get(url, timeout=10)
-        if r.status_code != 200:
-            return None
+def main() -> None:
+    logging.info("🚀 Face Matching Started")
 
-        with open(save_path, "wb") as f:
-            f.write(r.content)
+    # Read image path
+    if len(sys.argv) > 1:
+        image_path = sys.argv[1]
+    else:
+        image_path = input("Enter the path of the candidate image: ").strip()
 
-        emb = get_face_embedding(app, save_path)
-        if emb is None:
-            return None
+    results = run_match(image_path)
+    if results is None:
+        return
 
-        sim = compute_similarity(query_emb, emb)
+    with open(OUTPUT_JSON, "wb") as f:
+        f.write(json_dump_bytes(results))
 
-        return {
-            "name": f"{profile.get('localizedFirstName','')} {profile.get('localizedLastName','')}".strip(),
-            "profile": profile.get("publicProfileUrl", ""),
-            "similarity": round(sim, 4)
-        }
+    logging.info(f"💾 Saved to {OUTPUT_JSON}")
 
-    except:
-        return None
 
+if __name__ == "__main__":
+    print(" PYTHON SCRIPT STARTED ")
+    print("Received sys.argv =", sys.argv)
 
-print(" PYTHON SCRIPT STARTED ")
-print("Received sys.argv =", sys.argv)
+    main()
 
-main()
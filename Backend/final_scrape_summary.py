@@ -12,10 +12,14 @@ import random
 import re
 import signal
 import subprocess
+import hashlib
+import shelve
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Tuple, List, Optional, Union, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -27,6 +31,31 @@ from selenium.common.exceptions import TimeoutException, WebDriverException, NoS
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from fast_json import json_loads
+
+# ---- Fast JSON (Rust extension; stdlib json is the fallback) ----
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# ---- Multi-keyword matching (Aho-Corasick automaton; a regex alternation is the fallback) ----
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+# ---- Fast HTML parsing (C extensions; BeautifulSoup's pure-Python parser is the fallback) ----
+try:
+    from selectolax.parser import HTMLParser
+except Exception:
+    HTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = "lxml"
+except Exception:
+    _BS4_PARSER = "html.parser"
 
 # ---- AI client (Gemini) ----
 import google.generativeai as genai
@@ -54,6 +83,19 @@ USER_DATA_DIR = os.getenv("USER_DATA_DIR", "")
 MAX_SUMMARIZE_WORKERS = int(os.getenv("MAX_SUMMARIZE_WORKERS", "2"))
 ALLOW_AUTOMATED_LOGIN = os.getenv("ALLOW_AUTOMATED_LOGIN", "False").lower() in ("1", "true", "yes")
 SUMMARY_CHUNK_MAX = int(os.getenv("SUMMARY_CHUNK_MAX", "40000"))
+BLOCK_HEAVY_ASSETS = os.getenv("BLOCK_HEAVY_ASSETS", "True").lower() in ("1", "true", "yes")
+
+# Only the DOM text and img/video src attributes are used, so pictures, media and fonts are never
+# downloaded. Stylesheets stay: LinkedIn's lazy-loaded feed and "See more" buttons need the layout.
+BLOCKED_ASSET_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+BLOCKED_ASSET_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.mp4", "*.webm", "*.m3u8", "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds; 0 disables the cache
 
 COOKIES_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -114,12 +156,32 @@ def set_file_permissions_owner_only(path: Path):
     except Exception:
         logger.debug("Could not set strict file permissions for %s", path)
 
+def dump_json(obj, path: Union[str, Path]) -> None:
+    """Write obj as indented UTF-8 JSON in one write."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    Path(path).write_bytes(data)
+
+# Background file writes, so large outputs don't block parsing / summarization.
+# Worker threads are joined at interpreter exit, so pending writes still land.
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
+
+def write_bytes_async(path: Path, data: bytes):
+    def _log_failure(future):
+        if future.exception() is not None:
+            logger.warning("Could not write %s: %s", path, future.exception())
+    future = _IO_POOL.submit(path.write_bytes, data)
+    future.add_done_callback(_log_failure)
+    return future
+
+_PROFILE_URL_RE = re.compile(r"^https://([a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9\-_]+/?$")
+
 def validate_profile_url(url: str) -> bool:
     if not isinstance(url, str) or not url.strip():
         return False
-    url = url.strip()
-    pattern = r"^https://([a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9\-_]+/?$"
-    return re.match(pattern, url) is not None
+    return _PROFILE_URL_RE.match(url.strip()) is not None
 
 NOISE_KEYWORDS = [
     "About", "Accessibility", "Talent Solutions", "Careers", "Marketing Solutions",
@@ -129,39 +191,72 @@ NOISE_KEYWORDS = [
     "See more", "Show more", "People also viewed"
 ]
 
+# -------------------------------
+# Pre-compiled patterns
+# -------------------------------
+# one alternation instead of a lowercased substring test per keyword per line
+_NOISE_RE = re.compile("|".join(re.escape(k) for k in NOISE_KEYWORDS), re.I)
+_JSON_FENCE_RE = re.compile(r"```json|```")
+_JSON_OBJECT_RE = re.compile(r"(\{[\s\S]*\})")
+_DATE_RE = re.compile(r"ago|day|month|year", re.I)
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_HASHTAG2_RE = re.compile(r"hashtag\s+#\s*(\w+)", re.I)
+_MENTION_RE = re.compile(r"@([\w.-]+)")
+_NAME_RE = re.compile(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){0,2})\b")
+_MENTION_STOPWORDS = frozenset({"The", "This", "That", "With", "And", "For", "To", "A", "An", "It", "By", "Stay", "All"})
+_ENGAGEMENT_RE = re.compile(r"(?P<n>\d[\d,]*)\s+(?P<kind>like|comment|repost)", re.I)
+
+def _build_noise_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for k in NOISE_KEYWORDS:
+        automaton.add_word(k.lower(), k)
+    automaton.make_automaton()
+    return automaton
+
+# all keywords found in one linear scan of the line, instead of the regex engine's backtracking
+_NOISE_AC = _build_noise_automaton()
+
+def is_noise(line: str) -> bool:
+    if _NOISE_AC is not None:
+        return next(_NOISE_AC.iter(line.lower()), None) is not None
+    return _NOISE_RE.search(line) is not None
+
 def preprocess_text(text: str) -> str:
-    text = re.sub(r'\r', '\n', text)
-    lines = [ln.strip() for ln in text.splitlines() if len(ln.strip()) > 3]
-    lines = [ln for ln in lines if not any(k.lower() in ln.lower() for k in NOISE_KEYWORDS)]
-    seen = set()
-    filtered = []
-    for ln in lines:
-        if ln not in seen:
-            filtered.append(ln)
-            seen.add(ln)
+    text = text.replace("\r", "\n")
+    # one pass over the lines: strip, length and noise filters, then order-preserving dedup via dict keys
+    stripped = (ln.strip() for ln in text.splitlines())
+    filtered = list(dict.fromkeys(ln for ln in stripped if len(ln) > 3 and not is_noise(ln)))
     logger.info("Preprocessed text -> %d lines.", len(filtered))
     return "\n".join(filtered)
 
 def chunk_text(text: str, max_chars: int = SUMMARY_CHUNK_MAX) -> List[str]:
     if len(text) <= max_chars:
         return [text]
+    # lines are buffered in a list and joined once per chunk, not concatenated one at a time
     chunks = []
-    cur = ""
+    cur: List[str] = []
+    cur_len = 0
     for line in text.split("\n"):
-        if len(cur) + len(line) + 1 < max_chars:
-            cur += line + "\n"
-        else:
-            chunks.append(cur)
-            cur = line + "\n"
+        if cur_len + len(line) + 1 >= max_chars and cur:
+            chunks.append("\n".join(cur) + "\n")
+            cur, cur_len = [], 0
+        cur.append(line)
+        cur_len += len(line) + 1
     if cur:
-        chunks.append(cur)
+        chunks.append("\n".join(cur) + "\n")
     logger.info("Split text into %d chunks.", len(chunks))
     return chunks
 
 # -------------------------------
 # Gemini model selection & robust summarization
 # -------------------------------
-def choose_gemini_model(preferred: str = GEMINI_PREFERRED) -> str:
+GEMINI_MODEL_CACHE = Path.home() / ".gemini_model.cache"
+GEMINI_MODEL_CACHE_TTL = 24 * 3600
+
+def _select_gemini_model(preferred: str) -> Optional[str]:
+    """Pick a generateContent model from genai.list_models(); None if the listing failed."""
     try:
         models = genai.list_models()
         generate_models = [m.name for m in models if "generateContent" in (m.supported_generation_methods or [])]
@@ -180,13 +275,73 @@ def choose_gemini_model(preferred: str = GEMINI_PREFERRED) -> str:
         if generate_models:
             logger.info("No preferred found; using %s", generate_models[0])
             return generate_models[0]
+        return preferred
     except Exception:
         logger.exception("Could not list Gemini models; falling back to configured preferred model.")
-    return preferred
+    return None
+
+def choose_gemini_model(preferred: str = GEMINI_PREFERRED) -> str:
+    # the choice is remembered on disk for a day (per preferred model), saving a list_models() call per run
+    try:
+        if time.time() - GEMINI_MODEL_CACHE.stat().st_mtime < GEMINI_MODEL_CACHE_TTL:
+            cached_for, chosen = GEMINI_MODEL_CACHE.read_text(encoding="utf-8").split("\n")[:2]
+            if cached_for == preferred and chosen:
+                logger.info("Using cached Gemini model choice: %s", chosen)
+                return chosen
+    except Exception:
+        pass  # missing or malformed cache file
+    chosen = _select_gemini_model(preferred)
+    if chosen is None:
+        return preferred
+    try:
+        GEMINI_MODEL_CACHE.write_text(f"{preferred}\n{chosen}\n", encoding="utf-8")
+    except Exception:
+        logger.debug("Could not write %s", GEMINI_MODEL_CACHE)
+    return chosen
 
 GEMINI_MODEL = choose_gemini_model()
 
+@lru_cache(maxsize=4)
+def get_gemini_model(model_name: str):
+    """One GenerativeModel per model name, shared by every chunk, retry and thread."""
+    return genai.GenerativeModel(model_name)
+
+# Gemini responses keyed by sha256(model + text), so reruns on the same profile skip the paid calls
+LLM_CACHE_PATH = BASE_OUTPUT_DIR / "llm_cache.db"
+_llm_cache_lock = threading.Lock()
+
+def _llm_cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha256((model_name + "\0" + text).encode("utf-8")).hexdigest()
+
+def _llm_cache_get(key: str) -> Optional[str]:
+    if LLM_CACHE_TTL <= 0:
+        return None
+    try:
+        with _llm_cache_lock, shelve.open(str(LLM_CACHE_PATH)) as db:
+            entry = db.get(key)
+    except Exception:
+        logger.debug("LLM cache unavailable at %s", LLM_CACHE_PATH)
+        return None
+    if entry and time.time() - entry["ts"] < LLM_CACHE_TTL:
+        return entry["summary_text"]
+    return None
+
+def _llm_cache_put(key: str, summary_text: str) -> None:
+    if LLM_CACHE_TTL <= 0:
+        return
+    try:
+        with _llm_cache_lock, shelve.open(str(LLM_CACHE_PATH)) as db:
+            db[key] = {"summary_text": summary_text, "ts": time.time()}
+    except Exception:
+        logger.debug("Could not write LLM cache at %s", LLM_CACHE_PATH)
+
 def summarize_chunk_with_gemini(text: str, model_name: str = GEMINI_MODEL, retries: int = 5) -> Dict[str, str]:
+    cache_key = _llm_cache_key(model_name, text)
+    cached = _llm_cache_get(cache_key)
+    if cached is not None:
+        logger.info("Gemini summary served from cache.")
+        return {"summary_text": cached}
+
     prompt = f"""
 Summarize the following LinkedIn profile text into structured JSON
 with dynamic sections including relevant professional info such as 'personal_info', 'experience', 'education', 'skills', 'projects', and 'activity'.
@@ -203,11 +358,12 @@ Profile text:
         try:
             if not hasattr(genai, "GenerativeModel"):
                 raise RuntimeError("google.generativeai client missing GenerativeModel. Check package.")
-            model = genai.GenerativeModel(model_name)
+            model = get_gemini_model(model_name)
             resp = model.generate_content(prompt)
             summary_text = getattr(resp, "text", str(resp)).strip()
             if not summary_text:
                 raise ValueError("Empty response from Gemini.")
+            _llm_cache_put(cache_key, summary_text)
             return {"summary_text": summary_text}
         except Exception as e:
             backoff = min(30, (2 ** attempt) + random.random())
@@ -217,14 +373,14 @@ Profile text:
     return {"error": "Gemini summarization failed after retries"}
 
 def clean_and_parse_jsonish(text: str) -> Union[dict, list]:
-    cleaned = re.sub(r"```json|```", "", text).strip()
+    cleaned = _JSON_FENCE_RE.sub("", text).strip()
     try:
-        return json.loads(cleaned)
+        return json_loads(cleaned)
     except Exception:
-        m = re.search(r"(\{[\s\S]*\})", cleaned)
+        m = _JSON_OBJECT_RE.search(cleaned)
         if m:
             try:
-                return json.loads(m.group(1))
+                return json_loads(m.group(1))
             except Exception:
                 pass
     return {"summary_raw": cleaned}
@@ -247,6 +403,8 @@ def make_driver() -> webdriver.Chrome:
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.7444.60 Safari/537.36"
     )
+    if BLOCK_HEAVY_ASSETS:
+        options.add_experimental_option("prefs", BLOCKED_ASSET_PREFS)
 
     try:
         service = Service(CHROMEDRIVER_PATH) if CHROMEDRIVER_PATH else Service()
@@ -259,17 +417,28 @@ def make_driver() -> webdriver.Chrome:
                                {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"})
     except Exception:
         pass
+    if BLOCK_HEAVY_ASSETS:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_ASSET_URLS})
+        except Exception:
+            logger.debug("Could not block heavy assets via CDP; continuing with images disabled only.")
     logger.info("Chrome WebDriver initialized.")
     return driver
 
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
 def load_cookies(driver: webdriver.Chrome) -> bool:
     if not COOKIES_PATH.exists():
         logger.info("No cookies file found at %s", COOKIES_PATH)
         return False
     try:
         driver.get("https://www.linkedin.com")
-        with COOKIES_PATH.open("r", encoding="utf-8") as f:
-            cookies = json.load(f)
+        cookies = json_loads(COOKIES_PATH.read_bytes())
         for c in cookies:
             try:
                 cookie = {"name": c.get("name"), "value": c.get("value"), "path": c.get("path", "/")}
@@ -284,14 +453,29 @@ def load_cookies(driver: webdriver.Chrome) -> bool:
         logger.warning("Failed to load cookies: %s", e)
         return False
 
+_saved_cookie_digests: Dict[Path, str] = {}
+
 def save_cookies(driver: webdriver.Chrome, path: Path = COOKIES_PATH) -> None:
     try:
-        cookies = driver.get_cookies()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(cookies, f, indent=2)
-        set_file_permissions_owner_only(path)
-        logger.info("Cookies saved to %s", path)
+        # canonical bytes (sorted cookies and keys) so an unchanged session compares equal
+        cookies = sorted(driver.get_cookies(), key=lambda c: (c.get("domain", ""), c.get("path", ""), c.get("name", "")))
+        if orjson is not None:
+            data = orjson.dumps(cookies, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        else:
+            data = json.dumps(cookies, indent=2, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        unchanged = _saved_cookie_digests.get(path) == digest or _file_digest(path) == digest
+        if not unchanged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write next to the target and rename over it, so an interrupted run can't leave a truncated file
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            set_file_permissions_owner_only(tmp)
+            os.replace(tmp, path)
+            logger.info("Cookies saved to %s", path)
+        else:
+            logger.info("Cookies unchanged; %s left as is", path)
+        _saved_cookie_digests[path] = digest
     except Exception as e:
         logger.warning("Could not save cookies: %s", e)
 
@@ -320,8 +504,22 @@ def human_scroll(driver: webdriver.Chrome, scrolls: int = 10):
         driver.execute_script("window.scrollBy(0, window.innerHeight * 0.8);")
         time.sleep(0.6 + random.random())
 
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+def outer_html(driver: webdriver.Chrome, selector: str = "main") -> str:
+    """
+    Serialized HTML of the first element matching `selector` (whole document if none matches),
+    fetched over CDP instead of through the page_source JSON wire round trip.
+    """
+    try:
+        root = driver.execute_cdp_cmd("DOM.getDocument", {"depth": 0})["root"]
+        node_id = driver.execute_cdp_cmd("DOM.querySelector", {"nodeId": root["nodeId"], "selector": selector})["nodeId"]
+        return driver.execute_cdp_cmd("DOM.getOuterHTML", {"nodeId": node_id or root["nodeId"]})["outerHTML"]
+    except Exception:
+        return driver.page_source
+
 def safe_filename(name: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "Unknown"
+    return _UNSAFE_NAME_RE.sub("_", name).strip("_") or "Unknown"
 
 # -------------------------------
 # Extract profile content
@@ -333,13 +531,23 @@ def extract_profile(driver: webdriver.Chrome, url: str) -> Tuple[Path, str, str]
     human_scroll(driver, 10)
     name = driver.find_element(By.TAG_NAME, "h1").text.strip()
     html = driver.page_source
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(separator="\n", strip=True)
 
     folder = BASE_OUTPUT_DIR / f"{safe_filename(name)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     folder.mkdir(parents=True, exist_ok=True)
-    with open(folder / "page.html", "w", encoding="utf-8") as f:
-        f.write(html)
+    # the multi-MB page.html write runs in the background while the text is parsed
+    write_bytes_async(folder / "page.html", html.encode("utf-8"))
+
+    text = None
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(html)
+            # bs4's get_text skips these; drop them so inline JS/CSS never reaches the prompts
+            tree.strip_tags(["script", "style", "noscript", "template"])
+            text = (tree.body or tree.root).text(separator="\n", strip=True)
+        except Exception as e:
+            logger.debug("selectolax parse failed, falling back to BeautifulSoup: %s", e)
+    if text is None:
+        text = BeautifulSoup(html, _BS4_PARSER).get_text(separator="\n", strip=True)
     logger.info("Profile extracted: %s", name)
     return folder, name, text
 
@@ -358,97 +566,156 @@ def summarize_with_gemini(text: str) -> dict:
 # ================================
 # Extract posts (full code from posts module)
 # ================================
+FEED_END_XPATH = "//*[contains(text(), 'all caught up')]"
+
+# One in-page pass over the activity feed. Returns [rows, media] where each row carries the raw
+# fields of one post (text, link, repost author, date, engagement text); regex work stays in Python.
+# querySelectorAll returns elements in document order, so the "previous date span" of a post is
+# simply the last matching span seen before it. The whole document is scanned, as the HTML parse
+# always did: post media can render outside <main> (overlays, lazily mounted containers).
+POSTS_JS = r"""
+const root = document;
+const clean = el => (el ? el.textContent.replace(/\s+/g, ' ').trim() : '');
+const dateRe = /ago|day|month|year/i;
+const rows = [];
+let lastDate = '';
+for (const el of root.querySelectorAll('span, div[class*="update-components-text"]')) {
+  if (el.tagName === 'SPAN') {
+    if (!el.childElementCount && dateRe.test(el.textContent)) lastDate = el.textContent.trim();
+    continue;
+  }
+  const link = el.closest('a[href]');
+  const repost = el.closest('div[class*="feed-shared-reshared-update"]');
+  const author = repost && repost.querySelector('span[class*="feed-shared-actor__name"]');
+  const counts = el.closest('div[class*="social-details-social-counts"]');
+  rows.push({
+    text: clean(el),
+    link: link ? link.getAttribute('href') : null,
+    is_repost: !!repost,
+    author: clean(author),
+    date: lastDate,
+    engagement: clean(counts),
+  });
+}
+const media = [];
+for (const m of root.querySelectorAll('img[src], video[src]')) media.push(m.getAttribute('src'));
+return [rows, media];
+"""
+
+def _read_posts_js(driver) -> Tuple[List[dict], List[str]]:
+    rows, media = driver.execute_script(POSTS_JS)
+    return rows, [m for m in media if m]
+
+def _read_posts_soup(driver) -> Tuple[List[dict], List[str]]:
+    """Same rows as POSTS_JS, from the serialized feed parsed with BeautifulSoup."""
+    # whole document, like POSTS_JS: post media can render outside <main>
+    soup = BeautifulSoup(outer_html(driver, "html"), _BS4_PARSER)
+    media = [img["src"] for img in soup.find_all("img") if img.get("src")]
+    media += [vid["src"] for vid in soup.find_all("video") if vid.get("src")]
+    rows = []
+    for div in soup.find_all("div", class_=lambda c: c and "update-components-text" in c):
+        link_tag = div.find_parent("a", href=True)
+        repost_container = div.find_parent("div", class_=lambda c: c and "feed-shared-reshared-update" in c)
+        author_tag = repost_container.find("span", class_=lambda c: c and "feed-shared-actor__name" in c) if repost_container else None
+        date_elem = div.find_previous("span", string=_DATE_RE)
+        engagement_block = div.find_parent("div", class_=lambda c: c and "social-details-social-counts" in c)
+        rows.append({
+            "text": div.get_text(" ", strip=True),
+            "link": link_tag["href"] if link_tag else None,
+            "is_repost": bool(repost_container),
+            "author": author_tag.text.strip() if author_tag else "",
+            "date": date_elem.get_text(strip=True) if date_elem else "",
+            "engagement": engagement_block.get_text(" ", strip=True) if engagement_block else "",
+        })
+    return rows, media
+
 def extract_posts(driver, profile_url, folder, max_scrolls=30, scroll_pause=1.5):
     """
     Extract LinkedIn posts with improved mention/hashtag/media detection, repost handling,
     and automatic filling of empty fields.
     """
-    from bs4 import BeautifulSoup
-    import re, json, os, time, random, logging
-
     posts_url = profile_url.rstrip("/") + "/recent-activity/all/"
     logging.info(f"🔍 Fetching posts from: {posts_url}")
     driver.get(posts_url)
-    time.sleep(3)
+    try:
+        WebDriverWait(driver, 10, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") == "complete")
+    except TimeoutException:
+        pass
 
-    # Scroll dynamically to load all posts
+    # Scroll dynamically to load all posts: instead of a fixed pause per scroll, poll every 100ms
+    # and move on as soon as the feed grows; stop when it doesn't within scroll_pause seconds
+    # or LinkedIn shows its end-of-feed sentinel
     last_height = driver.execute_script("return document.body.scrollHeight")
     scrolls = 0
     while scrolls < max_scrolls:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(scroll_pause + random.random() * 0.5)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
+        try:
+            WebDriverWait(driver, scroll_pause + random.random() * 0.5, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.body.scrollHeight") != last_height
+                or d.find_elements(By.XPATH, FEED_END_XPATH))
+        except TimeoutException:
             break
-        last_height = new_height
+        if driver.find_elements(By.XPATH, FEED_END_XPATH):
+            break
+        last_height = driver.execute_script("return document.body.scrollHeight")
         scrolls += 1
 
-    html = driver.page_source
-    soup = BeautifulSoup(html, "html.parser")
+    try:
+        rows, all_media = _read_posts_js(driver)
+    except Exception as e:
+        logging.warning(f"In-page post extraction failed ({e}); parsing the HTML instead.")
+        rows, all_media = _read_posts_soup(driver)
+
     posts = []
     seen_texts = set()  # prevent duplicates
 
-    post_divs = soup.find_all("div", class_=lambda c: c and "update-components-text" in c)
-
-    for div in post_divs:
+    for row in rows:
         try:
-            post_text = div.get_text(" ", strip=True)
+            post_text = row["text"]
             if not post_text or post_text in seen_texts:
                 continue
             seen_texts.add(post_text)
 
             # 🔹 Post link
-            link_tag = div.find_parent("a", href=True)
+            href = row.get("link")
             post_link = None
-            if link_tag:
-                href = link_tag["href"]
+            if href:
                 post_link = href if href.startswith("http") else f"https://www.linkedin.com{href}"
 
             # 🔹 Repost detection
-            repost_container = div.find_parent("div", class_=lambda c: c and "feed-shared-reshared-update" in c)
-            is_repost = bool(repost_container)
+            is_repost = bool(row.get("is_repost"))
             reposted_from = None
             original_author = "Unknown"
-            if is_repost:
-                author_tag = repost_container.find("span", class_=lambda c: c and "feed-shared-actor__name" in c)
-                if author_tag:
-                    original_author = author_tag.text.strip()
-                    reposted_from = original_author
+            if is_repost and row.get("author"):
+                original_author = row["author"]
+                reposted_from = original_author
 
             # 🔹 Posted date
-            date_elem = div.find_previous("span", string=re.compile(r"ago|day|month|year", re.I))
-            posted_date = date_elem.get_text(strip=True) if date_elem else ""
+            posted_date = row.get("date") or ""
 
             # 🔹 Hashtags
-            hashtags = []
-            hashtags += re.findall(r"#(\w+)", post_text)  # normal hashtags
-            hashtags += re.findall(r"hashtag\s+#\s*(\w+)", post_text, flags=re.I)  # 'hashtag # DevOps'
-            hashtags = list(set(hashtags))
+            # normal hashtags + 'hashtag # DevOps'; deduplicated in first-seen order
+            hashtags = list(dict.fromkeys(_HASHTAG_RE.findall(post_text) + _HASHTAG2_RE.findall(post_text)))
 
             # 🔹 Mentions (handles @tags + name-like patterns)
-            mentions = []
-            mentions += re.findall(r"@([\w.-]+)", post_text)
             tail_text = post_text[-150:]
-            name_mentions = re.findall(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){0,2})\b", tail_text)
-            stopwords = {"The", "This", "That", "With", "And", "For", "To", "A", "An", "It", "By", "Stay", "All"}
-            mentions += [m for m in name_mentions if m not in stopwords]
-            mentions = list(set(mentions))
+            name_mentions = (m for m in _NAME_RE.findall(tail_text) if m not in _MENTION_STOPWORDS)
+            mentions = list(dict.fromkeys(_MENTION_RE.findall(post_text) + list(name_mentions)))
 
-            # 🔹 Media URLs
-            media_links = [img["src"] for img in soup.find_all("img") if img.get("src")]
-            media_links += [vid["src"] for vid in soup.find_all("video") if vid.get("src")]
+            # 🔹 Media URLs (page-wide list, collected once for all posts)
+            media_links = list(all_media)
 
             # 🔹 Engagement counts
             likes = comments = reposts_count = 0
-            engagement_block = div.find_parent("div", class_=lambda c: c and "social-details-social-counts" in c)
-            if engagement_block:
-                text = engagement_block.get_text(" ", strip=True)
-                likes_match = re.search(r"(\d[\d,]*)\s+like", text, re.I)
-                comments_match = re.search(r"(\d[\d,]*)\s+comment", text, re.I)
-                reposts_match = re.search(r"(\d[\d,]*)\s+repost", text, re.I)
-                likes = int(likes_match.group(1).replace(",", "")) if likes_match else 0
-                comments = int(comments_match.group(1).replace(",", "")) if comments_match else 0
-                reposts_count = int(reposts_match.group(1).replace(",", "")) if reposts_match else 0
+            if row.get("engagement"):
+                # one scan for all three counts; the first number of each kind wins
+                counts = {}
+                for m in _ENGAGEMENT_RE.finditer(row["engagement"]):
+                    counts.setdefault(m.group("kind").lower(), int(m.group("n").replace(",", "")))
+                likes = counts.get("like", 0)
+                comments = counts.get("comment", 0)
+                reposts_count = counts.get("repost", 0)
 
             # 🔹 Fill missing or empty fields
             if not posted_date:
@@ -461,12 +728,6 @@ def extract_posts(driver, profile_url, folder, max_scrolls=30, scroll_pause=1.5)
                 hashtags = ["None"]
             if not mentions:
                 mentions = ["None"]
-            if likes is None:
-                likes = 0
-            if comments is None:
-                comments = 0
-            if reposts_count is None:
-                reposts_count = 0
             if not original_author:
                 original_author = "Unknown"
             if reposted_from is None and is_repost:
@@ -492,87 +753,106 @@ def extract_posts(driver, profile_url, folder, max_scrolls=30, scroll_pause=1.5)
             continue
 
     # ✅ Save to file
-    with open(os.path.join(folder, "activity_posts.json"), "w", encoding="utf-8") as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
+    dump_json(posts, os.path.join(folder, "activity_posts.json"))
 
     logging.info(f"✅ Extracted {len(posts)} unique posts.")
     return posts
 
 # -------------------------------
-# MAIN function
+# Session helpers
 # -------------------------------
-def main(profile_url: str):
-    """Main orchestration: login → extract profile → Gemini summarization → posts → final_summary.json"""
-    if not validate_profile_url(profile_url):
-        raise ValueError("Provided profile_url is not a recognized LinkedIn /in/ URL.")
-    BASE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def wait_for_manual_login(driver: webdriver.Chrome, timeout: int = 300):
+    """Wait up to timeout seconds for user to complete login manually."""
+    start = time.time()
+    while time.time() - start < timeout:
+        if "feed" in driver.current_url.lower():
+            print("✅ Manual login detected, saving cookies...")
+            save_cookies(driver)
+            return
+        time.sleep(3)
+    raise TimeoutError("Manual login timeout reached — please log in manually in Chrome window.")
+
+def create_summary(folder: Path, cleaned_text: str, chunk_summaries: List[Union[dict, list, None]]):
+    """
+    Build the final Gemini summary JSON and validate it if the schema exists. The chunk summaries
+    are reused instead of resending the full text: a single chunk's summary is the final summary,
+    several are merged with one short prompt. The full text is only resent if a chunk failed.
+    """
+    logger.info("Creating final Gemini summary...")
+    ok = [c for c in chunk_summaries if c and not (isinstance(c, dict) and "error" in c)]
+    if ok and len(ok) == len(chunk_summaries):
+        if len(ok) == 1:
+            summary_raw = ok[0]
+        else:
+            summary_raw = summarize_with_gemini(
+                "MERGE THESE JSON PARTIAL SUMMARIES:\n" + json.dumps(ok, ensure_ascii=False))
+    else:
+        summary_raw = summarize_with_gemini(cleaned_text)
+    if not summary_raw:
+        return {"error": "Gemini summary failed"}
+
+    parsed = summary_raw if isinstance(summary_raw, dict) else {"summary_raw": str(summary_raw)}
+    if _HAS_SCHEMA and FinalSummarySchema:
+        try:
+            validated = FinalSummarySchema(**parsed)
+            with open(folder / "final_summary_validated.json", "w", encoding="utf-8") as f:
+                f.write(validated.model_dump_json(indent=2))
+            logger.info("Validated final_summary.json via Pydantic schema.")
+            return validated.model_dump()
+        except Exception as e:
+            logger.warning("Validation failed: %s", e)
+    return parsed
+
+# -------------------------------
+# Scraper: one browser + login, reused for every profile
+# -------------------------------
+class Scraper:
+    """
+    Chrome session logged into LinkedIn. Entering the context starts the driver and restores the
+    session (cookies → automated login → manual login); every scrape() inside it reuses them, so a
+    batch pays the browser start-up and login once.
+    """
+
+    def __init__(self):
+        self.driver: Optional[webdriver.Chrome] = None
+
+    def __enter__(self) -> "Scraper":
+        BASE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        self.driver = make_driver()
+        try:
+            self._setup_signal_handlers()
+            self._login()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            logger.debug("Driver quit error ignored during cleanup.")
+        self.driver = None
 
     # -----------------------------
-    # Local helper: safe signal exit
+    # Safe signal exit
     # -----------------------------
-    def _setup_signal_handlers(driver_container):
+    def _setup_signal_handlers(self):
         def handle_sigint(sig, frame):
             print("\nGracefully shutting down WebDriver...")
-            driver = driver_container.get("driver")
-            if driver:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
+            self.close()
             sys.exit(0)
         signal.signal(signal.SIGINT, handle_sigint)
 
     # -----------------------------
-    # Local helper: manual login wait
-    # -----------------------------
-    def wait_for_manual_login(driver, timeout=300):
-        """Wait up to timeout seconds for user to complete login manually."""
-        import time
-        start = time.time()
-        while time.time() - start < timeout:
-            if "feed" in driver.current_url.lower():
-                print("✅ Manual login detected, saving cookies...")
-                save_cookies(driver)
-                return
-            time.sleep(3)
-        raise TimeoutError("Manual login timeout reached — please log in manually in Chrome window.")
-
-    # -----------------------------
-    # Local helper: create final Gemini summary
-    # -----------------------------
-    def create_summary(folder: Path, cleaned_text: str):
-        """Combine all text into one Gemini summary JSON and validate if schema exists."""
-        logger.info("Creating final Gemini summary...")
-        summary_raw = summarize_with_gemini(cleaned_text)
-        if not summary_raw:
-            return {"error": "Gemini summary failed"}
-
-        parsed = summary_raw if isinstance(summary_raw, dict) else {"summary_raw": str(summary_raw)}
-        if _HAS_SCHEMA and FinalSummarySchema:
-            try:
-                validated = FinalSummarySchema(**parsed)
-                with open(folder / "final_summary_validated.json", "w", encoding="utf-8") as f:
-                    f.write(validated.model_dump_json(indent=2))
-                logger.info("Validated final_summary.json via Pydantic schema.")
-                return validated.model_dump()
-            except Exception as e:
-                logger.warning("Validation failed: %s", e)
-        return parsed
-
-    # -----------------------------
-    # Start pipeline
+    # Session restoration / login
     # -----------------------------
-    driver = None
-    driver_container = {"driver": None}
-
-    try:
-        driver = make_driver()
-        driver_container["driver"] = driver
-        _setup_signal_handlers(driver_container)
-
-        # -------------------------
-        # Session restoration / login
-        # -------------------------
+    def _login(self):
+        driver = self.driver
         logged_in = False
         if load_cookies(driver):
             driver.get("https://www.linkedin.com/feed/")
@@ -601,7 +881,14 @@ def main(profile_url: str):
             if not logged_in:
                 logger.info("Waiting for manual login...")
                 wait_for_manual_login(driver)
-                logged_in = True
+
+    # -----------------------------
+    # One profile: extract → Gemini summarization → posts → final_summary.json
+    # -----------------------------
+    def scrape(self, profile_url: str) -> Path:
+        if not validate_profile_url(profile_url):
+            raise ValueError("Provided profile_url is not a recognized LinkedIn /in/ URL.")
+        driver = self.driver
 
         # -------------------------
         # Extract profile
@@ -615,24 +902,31 @@ def main(profile_url: str):
         chunks = chunk_text(cleaned_text)
 
         logger.info("Generating Gemini summaries for %d chunks...", len(chunks))
-        for i, chunk in enumerate(chunks, start=1):
-            try:
-                summary_chunk = summarize_with_gemini(chunk)
-                chunk_file = folder / f"chunk_{i}_summary.txt"
-                with open(chunk_file, "w", encoding="utf-8") as f:
-                    # Save only Gemini’s structured summary, not raw chunk text
-                    if isinstance(summary_chunk, dict):
-                        f.write(summary_chunk.get("summary_text") or json.dumps(summary_chunk, indent=2))
-                    else:
-                        f.write(str(summary_chunk))
-                logger.info("Saved Gemini summary → %s", chunk_file.name)
-            except Exception as e:
-                logger.warning("Chunk %d summarization failed: %s", i, e)
+        # Gemini calls are network-bound: run them concurrently (bounded by MAX_SUMMARIZE_WORKERS
+        # to stay under the rate limits) and save each summary as soon as it arrives
+        chunk_summaries = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=max(1, MAX_SUMMARIZE_WORKERS)) as pool:
+            futures = {pool.submit(summarize_with_gemini, chunk): i for i, chunk in enumerate(chunks, start=1)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    summary_chunk = future.result()
+                    chunk_summaries[i - 1] = summary_chunk
+                    chunk_file = folder / f"chunk_{i}_summary.txt"
+                    with open(chunk_file, "w", encoding="utf-8") as f:
+                        # Save only Gemini’s structured summary, not raw chunk text
+                        if isinstance(summary_chunk, dict):
+                            f.write(summary_chunk.get("summary_text") or json.dumps(summary_chunk, indent=2))
+                        else:
+                            f.write(str(summary_chunk))
+                    logger.info("Saved Gemini summary → %s", chunk_file.name)
+                except Exception as e:
+                    logger.warning("Chunk %d summarization failed: %s", i, e)
 
         # -------------------------
         # Create final summary + extract posts
         # -------------------------
-        parsed_summary = create_summary(folder, cleaned_text)
+        parsed_summary = create_summary(folder, cleaned_text, chunk_summaries)
         logger.info("🔄 Starting posts extraction...")
         posts = extract_posts(driver, profile_url, folder)
         logger.info(f"📝 Extracted {len(posts)} posts")
@@ -653,41 +947,58 @@ def main(profile_url: str):
             if final_path.exists():
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                 alt_path = folder / f"final_summary_{ts}.json"
-                with open(alt_path, "w", encoding="utf-8") as f:
-                    json.dump(parsed_summary_to_save, f, indent=2, ensure_ascii=False)
+                dump_json(parsed_summary_to_save, alt_path)
                 logger.info("Existing summary detected; saved new file to %s", alt_path)
             else:
-                with open(final_path, "w", encoding="utf-8") as f:
-                    json.dump(parsed_summary_to_save, f, indent=2, ensure_ascii=False)
+                dump_json(parsed_summary_to_save, final_path)
                 logger.info("Saved → %s", final_path)
-                
+
             # Save posts as separate file
-            with open(folder / "activity_posts.json", "w", encoding="utf-8") as f:
-                json.dump(posts, f, indent=2, ensure_ascii=False)
+            dump_json(posts, folder / "activity_posts.json")
             logger.info("Saved activity posts to activity_posts.json")
-                
+
         except Exception as e:
             logger.warning("Failed to save files: %s", e)
             # Fallback: save posts separately
-            with open(folder / "activity_posts.json", "w", encoding="utf-8") as f:
-                json.dump(posts, f, indent=2, ensure_ascii=False)
+            dump_json(posts, folder / "activity_posts.json")
 
         logger.info("✅ Completed successfully. All outputs saved in: %s", folder)
+        return folder
 
-    finally:
-        try:
-            if driver:
-                driver.quit()
-        except Exception:
-            logger.debug("Driver quit error ignored during cleanup.")
+# -------------------------------
+# MAIN function
+# -------------------------------
+def main(profile_url: str):
+    """Main orchestration: login → extract profile → Gemini summarization → posts → final_summary.json"""
+    if not validate_profile_url(profile_url):
+        raise ValueError("Provided profile_url is not a recognized LinkedIn /in/ URL.")
+    with Scraper() as scraper:
+        return scraper.scrape(profile_url)
+
+def main_batch(profile_urls: List[str]) -> Dict[str, Optional[Path]]:
+    """Scrape several profiles with one browser and one login; returns each URL's output folder (None on failure)."""
+    invalid = [u for u in profile_urls if not validate_profile_url(u)]
+    if invalid:
+        raise ValueError(f"Not recognized LinkedIn /in/ URLs: {', '.join(invalid)}")
+    results: Dict[str, Optional[Path]] = {}
+    with Scraper() as scraper:
+        for url in profile_urls:
+            try:
+                results[url] = scraper.scrape(url)
+            except Exception as e:
+                logger.warning("Scrape failed for %s: %s", url, e)
+                results[url] = None
+    return results
 
 # -------------------------------
 # ENTRY POINT
 # -------------------------------
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python final_scrape_summary.py <linkedin_profile_url>")
+        print("Usage: python final_scrape_summary.py <linkedin_profile_url> [<linkedin_profile_url> ...]")
         sys.exit(1)
-    
-    profile_url = sys.argv[1]
-    main(profile_url)
+
+    if len(sys.argv) > 2:
+        main_batch(sys.argv[1:])
+    else:
+        main(sys.argv[1])
@@ -12,19 +12,26 @@ Usage examples:
 
 import os
 import re
+import asyncio
 import json
 import time
 import logging
 import argparse
 import requests
+import httpx
 import hashlib
 import cv2
 import numpy as np
 import shutil
+import shelve
+import mmap
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from tqdm import tqdm
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process
 from PIL import Image
 from io import BytesIO
 import sys
@@ -35,7 +42,7 @@ try:
 except Exception:
     genai = None
 
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 from selenium import webdriver
 from dotenv import load_dotenv
 from selenium.webdriver.common.by import By
@@ -45,15 +52,30 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from sklearn.metrics.pairwise import cosine_similarity
 
 # insightface (optional but required for face embedding)
 try:
     from insightface.app import FaceAnalysis
+    from insightface.utils import face_align
 except Exception:
     FaceAnalysis = None
+    face_align = None
 
 from requests.adapters import HTTPAdapter, Retry
+from fast_json import json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
 
 # =========================================
 # CONFIGURATION & SETUP
@@ -70,9 +92,61 @@ OUTPUT_DIR = os.path.join(BASE_DIR, "results")
 TEMP_DIR = os.path.join(BASE_DIR, "temp_photos")
 PROFILES_PATH = os.path.join(BASE_DIR, "profiles.json")  # optional LinkedIn export fallback
 
+FACE_MODEL_NAME = "buffalo_l"
 SIMILARITY_THRESHOLD = 0.35
 DETECTION_SCORE_THRESHOLD = 0.5
 MAX_WORKERS = 6
+# Chrome sessions used to visit candidate profiles in parallel (1 = primary browser only)
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "3"))
+# Parallel downloads for the images of an extracted profile
+IMAGE_DOWNLOAD_WORKERS = 16
+# Read size when streaming downloaded images to disk
+COPY_CHUNK_SIZE = 64 * 1024
+# Async batch downloads of profile pictures: in-flight requests and pooled keep-alive connections
+DOWNLOAD_CONCURRENCY = 16
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+# Explicit waits poll this often instead of Selenium's 0.5s default
+POLL_FREQUENCY = 0.1
+# Chrome content settings for sessions that only need the DOM (2 = block)
+BLOCKED_ASSET_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+}
+# Same idea at runtime through CDP, for the primary browser which must still render screenshots
+BLOCKED_ASSET_URLS = ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css"]
+# caches live in OUTPUT_DIR: TEMP_DIR is wiped after each facial recognition run
+PROFILE_CACHE_PATH = os.path.join(OUTPUT_DIR, "profile_cache.db")
+EMBEDDING_CACHE_PATH = os.path.join(OUTPUT_DIR, "embedding_cache.db")
+# in-memory hot set in front of the embedding cache
+EMBEDDING_MEMO_SIZE = 256
+# Scored Facebook pages / photo embeddings are reused for this long across runs
+PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "86400"))
+
+# Selectors and patterns used per page / per profile, compiled once
+SEARCH_INPUT_XPATH = "//input[contains(@placeholder,'Search') or @aria-label='Search Facebook' or @aria-label='Search']"
+PROFILE_IMG_XPATH = "//img[contains(@src,'profile') or contains(@src,'scontent') or contains(@src,'cdn')]"
+# one find_elements round trip for all "See more" variants
+SEE_MORE_XPATH = "//div[contains(., 'See more')] | //span[contains(text(), 'See more')] | //a[contains(text(), 'See more')]"
+# search result anchors after index arguments[0], minus hrefs matching the regex source arguments[1]:
+# [total anchor count, [[href without query/trailing slash, visible name], ...]]
+SEARCH_ANCHORS_JS = """
+    const anchors = document.querySelectorAll('a[role="link"][href*="facebook.com"]');
+    const exclude = new RegExp(arguments[1], 'i');
+    const rows = [];
+    for (const a of Array.prototype.slice.call(anchors, arguments[0])) {
+        const href = a.href.split('?')[0].replace(/\\/+$/, '');
+        if (!href || exclude.test(href)) continue;
+        const s = a.querySelector('span');
+        rows.push([href, (s ? s.innerText : a.innerText).trim()]);
+    }
+    return [anchors.length, rows];
+"""
+SEARCH_ANCHOR_COUNT_JS = "return document.querySelectorAll('a[role=\"link\"][href*=\"facebook.com\"]').length;"
+FB_EXCLUDE_PATTERN = r"/(?:groups|events|marketplace|pages)/"
+_STYLE_URL_RE = re.compile(r'url\("([^"]+)"\)')
+_SAFE_NAME_RE = re.compile(r'[\\/*?:"<>|]')
+_MD_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(TEMP_DIR, exist_ok=True)
@@ -95,38 +169,181 @@ if GEMINI_API_KEY and genai:
 else:
     gemini_model = None
 
+def read_json(path: str) -> Any:
+    """Parse a JSON file straight from a read-only memory map, without first copying it into a bytes object."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return json_loads(f.read())
+    with mm:
+        if orjson is not None:
+            # the view must be released before the map closes
+            with memoryview(mm) as view:
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    pass  # NaN literals etc., see json_loads
+        return json.loads(mm[:])
+
+def json_dump_bytes(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+@lru_cache(maxsize=4096)
+def url_digest(url: str) -> str:
+    """sha256 hex of a URL, memoized: the same URLs are looked up in the caches again and again."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
 # =========================================
 # FACE RECOGNITION ENGINE
 # =========================================
-class FaceRecognitionEngine:
-    """Face embedding and similarity utilities"""
-    def __init__(self):
-        self.app = None
-        self.session = self._create_session()
-
-    def _create_session(self) -> requests.Session:
-        session = requests.Session()
-        retries = Retry(total=3, backoff_factor=1, status_forcelist=[500,502,503,504])
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
-
-    def initialize(self):
-        if self.app is not None:
-            return
+@njit(cache=True, fastmath=True)
+def _cosine_batch(query, E):
+    """Cosine similarity of `query` (D,) against every row of `E` (N, D), float32."""
+    out = np.empty(E.shape[0], dtype=np.float32)
+    qn = np.sqrt((query * query).sum())
+    for i in range(E.shape[0]):
+        dot = 0.0
+        en = 0.0
+        for j in range(query.shape[0]):
+            dot += query[j] * E[i, j]
+            en += E[i, j] * E[i, j]
+        out[i] = dot / (qn * np.sqrt(en) + 1e-9)
+    return out
+
+
+def cosine_batch(query: np.ndarray, E: np.ndarray) -> np.ndarray:
+    return _cosine_batch(np.ascontiguousarray(query, dtype=np.float32).ravel(),
+                         np.ascontiguousarray(E, dtype=np.float32))
+
+
+def quantize_embedding(emb: np.ndarray) -> np.ndarray:
+    """L2-normalise and store as int8 with a fixed scale of 1/127 (4x smaller than float32)."""
+    emb = np.asarray(emb, dtype=np.float32).ravel()
+    emb = emb / max(float(np.linalg.norm(emb)), 1e-12)
+    return np.clip(np.round(emb * 127), -127, 127).astype(np.int8)
+
+
+@njit(cache=True, fastmath=True)
+def _dot_int8(q, E):
+    out = np.empty(E.shape[0], dtype=np.float32)
+    for i in range(E.shape[0]):
+        acc = 0
+        for j in range(q.shape[0]):
+            acc += np.int32(q[j]) * np.int32(E[i, j])
+        out[i] = acc / 16129.0  # 127 * 127
+    return out
+
+
+def cosine_batch_int8(q8: np.ndarray, E8: np.ndarray) -> np.ndarray:
+    """Cosine similarities of quantized (already normalised) embeddings, int32 accumulation."""
+    return _dot_int8(np.ascontiguousarray(q8, dtype=np.int8).ravel(), np.ascontiguousarray(E8, dtype=np.int8))
+
+# The face model is loaded once per process and shared by every engine: weight loading dominates
+# startup when verifications run back to back in one service.
+_FACE_MODEL = None
+_FACE_MODEL_LOADED = False
+_FACE_MODEL_LOCK = threading.Lock()
+
+def load_face_model():
+    """Process-wide FaceAnalysis instance (None if InsightFace is missing or failed to load)."""
+    global _FACE_MODEL, _FACE_MODEL_LOADED
+    if _FACE_MODEL_LOADED:
+        return _FACE_MODEL
+    with _FACE_MODEL_LOCK:
+        if _FACE_MODEL_LOADED:
+            return _FACE_MODEL
+        # one attempt per process: a failed load is not retried on every verification
+        _FACE_MODEL_LOADED = True
         if FaceAnalysis is None:
             logging.error("InsightFace not installed. Face functionality will be disabled.")
-            return
+            return None
         logging.info("Initializing InsightFace model...")
         try:
             # Use ctx_id=-1 if you want CPU only
-            self.app = FaceAnalysis(name="buffalo_l")
-            self.app.prepare(ctx_id=0, det_size=(640,640))
+            app = FaceAnalysis(name=FACE_MODEL_NAME)
+            app.prepare(ctx_id=0, det_size=(640,640))
+            # compile (or load from the numba cache) the similarity kernels now, not on the first match
+            cosine_batch(np.ones(2, dtype=np.float32), np.ones((1, 2), dtype=np.float32))
+            cosine_batch_int8(np.ones(2, dtype=np.int8), np.ones((1, 2), dtype=np.int8))
+            _FACE_MODEL = app
             logging.info("Face model prepared.")
         except Exception as e:
             logging.error(f"Failed to initialize face model: {e}")
-            self.app = None
+        return _FACE_MODEL
+
+class EmbeddingCache:
+    """
+    Quantized (int8) face embeddings of downloaded pictures keyed by model name + sha256(image url),
+    on disk (shelve) with a small in-memory LRU in front. b"" marks a picture without a usable face.
+    """
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, model_name: str = FACE_MODEL_NAME,
+                 memo_size: int = EMBEDDING_MEMO_SIZE):
+        self.path = path
+        self.model_name = model_name
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, url: str) -> str:
+        return f"{self.model_name}:int8:{url_digest(url)}"
+
+    def _remember(self, key: str, value: bytes):
+        self._memo[key] = value
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def get_many(self, urls: List[str]) -> Dict[str, bytes]:
+        """Cached values for the urls that have one."""
+        found = {}
+        with self._lock:
+            missing = []
+            for url in urls:
+                key = self.key(url)
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    found[url] = self._memo[key]
+                else:
+                    missing.append(url)
+            if missing:
+                with shelve.open(self.path) as db:
+                    for url in missing:
+                        key = self.key(url)
+                        value = db.get(key)
+                        if value is not None:
+                            found[url] = value
+                            self._remember(key, value)
+        return found
+
+    def put_many(self, embeddings: Dict[str, Optional[np.ndarray]]):
+        if not embeddings:
+            return
+        with self._lock, shelve.open(self.path) as db:
+            for url, emb in embeddings.items():
+                key = self.key(url)
+                value = b"" if emb is None else quantize_embedding(emb).tobytes()
+                db[key] = value
+                self._remember(key, value)
+
+    @staticmethod
+    def decode(value: bytes) -> Optional[np.ndarray]:
+        return np.frombuffer(value, dtype=np.int8) if value else None
+
+class FaceRecognitionEngine:
+    """Face embedding and similarity utilities"""
+    def __init__(self):
+        self.app = None
+        self._initialized = False
+        self.embedding_cache = EmbeddingCache()
+
+    def initialize(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.app = load_face_model()
 
     def get_embedding(self, image_path: str) -> Optional[np.ndarray]:
         if self.app is None:
@@ -138,40 +355,83 @@ class FaceRecognitionEngine:
         if img is None:
             logging.debug(f"Cannot read image: {image_path}")
             return None
+        return self._embed_array(img, image_path)
+
+    def _embed_array(self, img: np.ndarray, label: str = "image") -> Optional[np.ndarray]:
         faces = self.app.get(img)
         if not faces:
-            logging.debug(f"No faces in image: {image_path}")
+            logging.debug(f"No faces in image: {label}")
             return None
         faces = [f for f in faces if getattr(f, "det_score", 1.0) >= DETECTION_SCORE_THRESHOLD]
         if not faces:
-            logging.debug(f"No high-quality faces in: {image_path}")
+            logging.debug(f"No high-quality faces in: {label}")
             return None
         if len(faces) > 1:
             faces.sort(key=lambda x: (x.bbox[2]-x.bbox[0])*(x.bbox[3]-x.bbox[1]), reverse=True)
         return faces[0].embedding
 
-    def compute_similarity(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
-        try:
-            return float(cosine_similarity([emb1], [emb2])[0][0])
-        except Exception:
-            return 0.0
+    def get_embeddings_batch(self, images: List[Optional[np.ndarray]]) -> List[Optional[np.ndarray]]:
+        """
+        Embed the largest good face of each image. Detection runs per image (sizes differ),
+        then every aligned face goes through the recognition model in one batched forward pass.
+        """
+        if self.app is None:
+            self.initialize()
+        if self.app is None:
+            return [None] * len(images)
+        rec_model = self.app.models.get("recognition")
+        if rec_model is None or face_align is None:
+            return [self._embed_array(img) if img is not None else None for img in images]
+
+        crops, owners = [], []
+        for i, img in enumerate(images):
+            if img is None:
+                continue
+            bboxes, kpss = self.app.det_model.detect(img, max_num=0, metric="default")
+            if bboxes.shape[0] == 0 or kpss is None:
+                continue
+            good = np.flatnonzero(bboxes[:, 4] >= DETECTION_SCORE_THRESHOLD)
+            if good.size == 0:
+                continue
+            areas = (bboxes[good, 2] - bboxes[good, 0]) * (bboxes[good, 3] - bboxes[good, 1])
+            best = good[int(np.argmax(areas))]
+            crops.append(face_align.norm_crop(img, landmark=kpss[best], image_size=rec_model.input_size[0]))
+            owners.append(i)
+
+        embeddings: List[Optional[np.ndarray]] = [None] * len(images)
+        if crops:
+            feats = rec_model.get_feat(crops)
+            for i, feat in zip(owners, feats):
+                embeddings[i] = feat.flatten()
+        return embeddings
+
+    def fetch_images(self, urls: List[str]) -> List[Optional[np.ndarray]]:
+        """Download and decode every url concurrently on one event loop, entirely in memory."""
+        if not urls:
+            return []
+        return asyncio.run(self._fetch_all(urls))
+
+    async def _fetch_all(self, urls: List[str]) -> List[Optional[np.ndarray]]:
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=3)
+        # one client for the whole batch so keep-alive connections and TLS sessions are reused
+        async with httpx.AsyncClient(transport=transport, timeout=10, follow_redirects=True,
+                                     headers={"User-Agent": "Mozilla/5.0"}) as client:
+            async def fetch(url: str) -> Optional[np.ndarray]:
+                if url.startswith("//"):
+                    url = "https:" + url
+                async with semaphore:
+                    try:
+                        r = await client.get(url)
+                    except Exception as e:
+                        logging.debug(f"Download failed ({url}): {e}")
+                        return None
+                if r.status_code != 200 or not r.content:
+                    return None
+                # decode straight from the response bytes, no temp file; off the loop so downloads keep flowing
+                return await asyncio.to_thread(cv2.imdecode, np.frombuffer(r.content, np.uint8), cv2.IMREAD_COLOR)
 
-    def download_image(self, url: str, save_path: str) -> bool:
-        try:
-            if not url:
-                return False
-            # some URLs are protocol-relative or start with //
-            if url.startswith("//"):
-                url = "https:" + url
-            r = self.session.get(url, timeout=12, headers={"User-Agent": "Mozilla/5.0"})
-            if r.status_code == 200 and r.content:
-                with open(save_path, "wb") as f:
-                    f.write(r.content)
-                return True
-            return False
-        except Exception as e:
-            logging.debug(f"Download failed ({url}): {e}")
-            return False
+            return await asyncio.gather(*[fetch(url) for url in urls])
 
 # =========================================
 # LINKEDIN DATA HANDLER
@@ -182,9 +442,14 @@ class LinkedInDataHandler:
         if not os.path.exists(profiles_path):
             logging.warning(f"{profiles_path} not found")
             return []
+        # parsed once per file version; a rewritten profiles.json has a new mtime and is re-read
+        return LinkedInDataHandler._load_profiles_cached(profiles_path, os.path.getmtime(profiles_path))
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_profiles_cached(profiles_path: str, mtime: float) -> List[Dict[str, Any]]:
         try:
-            with open(profiles_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(profiles_path)
             if isinstance(data, dict) and "elements" in data:
                 data = data["elements"]
             if not isinstance(data, list):
@@ -202,8 +467,7 @@ class LinkedInDataHandler:
         metadata_path = os.path.join(input_dir, "metadata.json")
         if os.path.exists(metadata_path):
             try:
-                with open(metadata_path, "r", encoding="utf-8") as f:
-                    linkedin_data["metadata"] = json.load(f)
+                linkedin_data["metadata"] = read_json(metadata_path)
             except Exception as e:
                 logging.error(f"Failed to read metadata.json: {e}")
 
@@ -218,9 +482,7 @@ class LinkedInDataHandler:
         summary_path = os.path.join(input_dir, "summary.json")
         if os.path.exists(summary_path):
             try:
-                with open(summary_path, "r", encoding="utf-8") as f:
-                    s = json.load(f)
-                    linkedin_data["summary_text"] = json.dumps(s, indent=2)
+                linkedin_data["summary_text"] = json_dump_bytes(read_json(summary_path)).decode("utf-8")
             except Exception as e:
                 logging.error(f"Failed to read summary.json: {e}")
 
@@ -290,17 +552,51 @@ class LinkedInDataHandler:
 # =========================================
 # FACEBOOK SCRAPER
 # =========================================
+def set_asset_blocking(driver: webdriver.Chrome, enabled: bool):
+    """Toggle blocking of images/fonts/CSS requests on a live browser via CDP."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_ASSET_URLS if enabled else []})
+    except Exception as e:
+        logging.debug(f"Could not toggle asset blocking: {e}")
+
+
 class FacebookScraper:
-    def __init__(self, user_data_dir: str = None, profile_dir: str = None, use_profile: bool = False):
+    def __init__(self, user_data_dir: str = None, profile_dir: str = None, use_profile: bool = False,
+                 block_assets: bool = False, headless: bool = False):
         self.driver = None
         self.use_profile = use_profile
+        # DOM-only sessions (candidate scoring) never download images, fonts or stylesheets
+        self.block_assets = block_assets
+        # no window or GPU compositing; not for sessions that log in (2FA) or take screenshots
+        self.headless = headless
         # default to user's Chrome path if none provided
         self.user_data_dir = user_data_dir or os.path.expanduser(r"C:\Users\Default\AppData\Local\Google\Chrome\User Data")
         self.profile_dir = profile_dir or "Default"
+        self._img_session = self._create_image_session()
+
+    @staticmethod
+    def _create_image_session() -> requests.Session:
+        # keep-alive pool shared by all image downloads of this scraper
+        session = requests.Session()
+        session.headers["User-Agent"] = "Mozilla/5.0"
+        retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[500,502,503,504])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        return WebDriverWait(self.driver, timeout, poll_frequency=POLL_FREQUENCY)
 
     def launch_browser(self):
         options = Options()
-        options.add_argument("--start-maximized")
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--window-size=1280,800")
+        else:
+            options.add_argument("--start-maximized")
         options.add_argument("--disable-notifications")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-dev-shm-usage")
@@ -308,6 +604,9 @@ class FacebookScraper:
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.block_assets:
+            options.add_experimental_option("prefs", BLOCKED_ASSET_PREFS)
+            options.add_argument("--blink-settings=imagesEnabled=false")
 
         if self.use_profile and self.user_data_dir:
             # sanitize and ensure path exists (we won't create arbitrary user profile dirs but allow user to pass existing path)
@@ -344,29 +643,31 @@ class FacebookScraper:
         try:
             # go to facebook and check if logged in by presence of search box or top nav
             self.driver.get("https://www.facebook.com")
-            time.sleep(2)
+            # wait until either the logged-in search box or the login form renders
             try:
-                # common selectors for logged-in search
-                self.driver.find_element(By.XPATH, "//input[contains(@placeholder,'Search') or @aria-label='Search Facebook' or @aria-label='Search']")
+                self._wait(8).until(EC.any_of(
+                    EC.presence_of_element_located((By.XPATH, SEARCH_INPUT_XPATH)),
+                    EC.presence_of_element_located((By.ID, "email"))
+                ))
+            except TimeoutException:
+                pass
+            # common selectors for logged-in search; find_elements returns [] instead of raising
+            if self.driver.find_elements(By.XPATH, SEARCH_INPUT_XPATH):
                 logging.info("Already logged in")
                 return True
-            except Exception:
-                pass
 
             # try login page
             self.driver.get("https://www.facebook.com/login")
-            time.sleep(2)
             # cookie consent
             try:
-                cookie_btn = WebDriverWait(self.driver, 4).until(
+                cookie_btn = self._wait(4).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Allow all cookies') or contains(., 'Accept All') or contains(., 'Allow') or contains(., 'Accept')]"))
                 )
                 cookie_btn.click()
-                time.sleep(1)
             except Exception:
                 pass
 
-            email_input = WebDriverWait(self.driver, 8).until(EC.presence_of_element_located((By.ID, "email")))
+            email_input = self._wait(8).until(EC.presence_of_element_located((By.ID, "email")))
             email_input.clear()
             email_input.send_keys(FACEBOOK_USER)
             password_input = self.driver.find_element(By.ID, "pass")
@@ -374,25 +675,32 @@ class FacebookScraper:
             password_input.send_keys(FACEBOOK_PASS)
             login_button = self.driver.find_element(By.NAME, "login")
             login_button.click()
-            time.sleep(4)
+            # proceed as soon as we land on the feed or a 2FA checkpoint
+            try:
+                self._wait(20).until(EC.any_of(
+                    EC.url_contains("checkpoint"),
+                    EC.url_contains("two_factor"),
+                    EC.presence_of_element_located((By.XPATH, SEARCH_INPUT_XPATH))
+                ))
+            except TimeoutException:
+                pass
 
             current_url = self.driver.current_url
             if "checkpoint" in current_url or "two_factor" in current_url:
                 logging.warning("Two-factor login required. Please complete 2FA in the opened browser window.")
                 # wait for manual completion
-                for i in range(60):
-                    time.sleep(2)
-                    try:
-                        self.driver.find_element(By.XPATH, "//input[contains(@placeholder,'Search') or @aria-label='Search Facebook' or @aria-label='Search']")
-                        logging.info("2FA completed")
-                        return True
-                    except Exception:
-                        continue
-                logging.error("2FA timeout")
-                return False
-
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder,'Search') or @aria-label='Search Facebook' or @aria-label='Search']"))
+                try:
+                    self._wait(120).until(
+                        EC.presence_of_element_located((By.XPATH, SEARCH_INPUT_XPATH))
+                    )
+                    logging.info("2FA completed")
+                    return True
+                except TimeoutException:
+                    logging.error("2FA timeout")
+                    return False
+
+            self._wait(20).until(
+                EC.presence_of_element_located((By.XPATH, SEARCH_INPUT_XPATH))
             )
             logging.info("Successfully logged in")
             return True
@@ -410,65 +718,54 @@ class FacebookScraper:
         candidates = []
         try:
             self.driver.get("https://www.facebook.com")
-            time.sleep(2)
-            search_bar = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder,'Search') or @aria-label='Search Facebook' or @aria-label='Search']"))
+            search_bar = self._wait(20).until(
+                EC.presence_of_element_located((By.XPATH, SEARCH_INPUT_XPATH))
             )
             search_bar.clear()
             search_bar.send_keys(query)
             search_bar.send_keys(Keys.RETURN)
-            time.sleep(3)
+            try:
+                self._wait(10).until(EC.url_contains("/search/"))
+            except TimeoutException:
+                pass
             # press People tab if available
             try:
-                people_tab = WebDriverWait(self.driver, 4).until(
+                people_tab = self._wait(4).until(
                     EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'People') or contains(@aria-label, 'People')]"))
                 )
                 people_tab.click()
-                time.sleep(2)
+                self._wait(10).until(EC.url_contains("/search/people"))
             except Exception:
                 pass
 
-            # Scroll & collect anchors
+            anchor_xpath = "//a[contains(@href,'facebook.com') and @role='link']"
+            try:
+                self._wait(10).until(EC.presence_of_element_located((By.XPATH, anchor_xpath)))
+            except TimeoutException:
+                pass
+
+            # Scroll & collect anchors; each pass fetches only the anchors added since the last one,
+            # href and visible name included, in a single script call
             scrolls = 8
             seen = set()
+            last_count = 0
             for _ in range(scrolls):
-                anchors = self.driver.find_elements(By.XPATH, "//a[contains(@href,'facebook.com') and @role='link']")
-                for a in anchors:
-                    try:
-                        href = a.get_attribute("href")
-                    except Exception:
-                        href = None
-                    if not href:
-                        continue
-                    href = href.split("?")[0].rstrip("/")
+                last_count, rows = self.driver.execute_script(SEARCH_ANCHORS_JS, last_count, FB_EXCLUDE_PATTERN)
+                for href, name in rows:
                     if href in seen:
                         continue
-                    # some exclude patterns
-                    if any(p in href.lower() for p in ["/groups/","/events/","/marketplace/","/pages/"]):
-                        continue
-                    # try to get name
-                    name = ""
-                    try:
-                        # many search anchors include a span or div with the visible name
-                        name_el = a.find_element(By.XPATH, ".//span")
-                        name = name_el.text.strip()
-                    except Exception:
-                        try:
-                            name = a.text.strip()
-                        except Exception:
-                            name = ""
                     seen.add(href)
                     candidates.append({"url": href, "name": name})
                     if len(candidates) >= limit:
                         break
                 if len(candidates) >= limit:
                     break
-                # scroll down
+                # scroll down and wait (up to 2s) for more results to load
                 try:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    self._wait(2).until(lambda d: d.execute_script(SEARCH_ANCHOR_COUNT_JS) > last_count)
                 except Exception:
                     pass
-                time.sleep(2)
             logging.info(f"Found {len(candidates)} candidates for query '{query}'")
             return candidates[:limit]
         except Exception as e:
@@ -476,79 +773,115 @@ class FacebookScraper:
             return candidates
 
     def _expand_all_content(self):
-        show_more_xpaths = [
-            "//div[contains(., 'See more')]",
-            "//span[contains(text(), 'See more')]",
-            "//a[contains(text(), 'See more')]"
-        ]
         for _ in range(10):
             clicked = False
-            for xpath in show_more_xpaths:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, xpath)
-                    for el in elements[:5]:
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", el)
-                            time.sleep(0.2)
-                            el.click()
-                            clicked = True
-                            time.sleep(0.4)
-                        except Exception:
-                            continue
-                except Exception:
-                    continue
+            try:
+                elements = self.driver.find_elements(By.XPATH, SEE_MORE_XPATH)
+                for el in elements[:15]:
+                    try:
+                        self.driver.execute_script("arguments[0].scrollIntoView(true);", el)
+                        time.sleep(0.2)
+                        el.click()
+                        clicked = True
+                        time.sleep(0.4)
+                    except Exception:
+                        continue
+            except Exception:
+                pass
             if not clicked:
                 break
 
     def _scroll_to_bottom(self):
+        # Runs entirely in the page: keeps scrolling until scrollHeight has been stable for ~2s
+        # (5 ticks of 400ms) or 36s have passed, then calls back once with the number of scrolls.
+        script = """
+            const done = arguments[arguments.length - 1];
+            let last = document.body.scrollHeight, stable = 0, scrolls = 0;
+            const started = Date.now();
+            const timer = setInterval(() => {
+                window.scrollTo(0, document.body.scrollHeight);
+                scrolls++;
+                const height = document.body.scrollHeight;
+                stable = height === last ? stable + 1 : 0;
+                last = height;
+                if (stable >= 5 || Date.now() - started > 36000) {
+                    clearInterval(timer);
+                    done(scrolls);
+                }
+            }, 400);
+        """
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            for _ in range(30):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.2)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            self.driver.set_script_timeout(45)
+            scrolls = self.driver.execute_async_script(script)
+            logging.debug(f"Scrolled {scrolls} times")
         except Exception:
             pass
 
-    def _extract_images(self, soup, output_folder, limit=50):
+    @staticmethod
+    def _visible_lines(tree: HTMLParser):
+        """Yield the stripped, non-empty text lines of the page (scripts/styles excluded)."""
+        tree.strip_tags(["script", "style", "noscript"])
+        root = tree.body or tree.root
+        if root is None:
+            return
+        for node in root.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            for line in node.text_content.strip().split("\n"):
+                if line:
+                    yield line
+
+    def _extract_images(self, tree: HTMLParser, output_folder, limit=50):
         image_urls = set()
-        for img in soup.find_all("img"):
-            src = img.get("src")
+        for img in tree.css("img"):
+            src = img.attributes.get("src")
             if src and ("scontent" in src or "profile" in src or "cdn" in src):
                 image_urls.add(src)
-        for div in soup.find_all("div", style=True):
-            match = re.search(r'url\("([^"]+)"\)', div['style'])
+        for div in tree.css("div[style]"):
+            match = _STYLE_URL_RE.search(div.attributes.get("style") or "")
             if match:
                 image_urls.add(match.group(1))
         images_folder = os.path.join(output_folder, "facebook_images")
         os.makedirs(images_folder, exist_ok=True)
-        for i, url in enumerate(list(image_urls)[:limit], 1):
-            try:
-                if not url:
-                    continue
-                if url.startswith("//"):
-                    url = "https:" + url
-                response = requests.get(url, stream=True, timeout=12, headers={"User-Agent": "Mozilla/5.0"})
+        with ThreadPoolExecutor(max_workers=IMAGE_DOWNLOAD_WORKERS) as executor:
+            for i, url in enumerate(list(image_urls)[:limit], 1):
+                if url:
+                    executor.submit(self._download_image, url, images_folder, i)
+
+    def _download_image(self, url: str, images_folder: str, i: int):
+        try:
+            if url.startswith("//"):
+                url = "https:" + url
+            with self._img_session.get(url, stream=True, timeout=12) as response:
                 if response.status_code == 200:
                     ext = url.split("?")[0].split(".")[-1]
                     if len(ext) > 4 or "/" in ext:
                         ext = "jpg"
                     img_path = os.path.join(images_folder, f"image_{i}.{ext}")
+                    response.raw.decode_content = True
                     with open(img_path, "wb") as f:
-                        for chunk in response.iter_content(1024):
-                            f.write(chunk)
-            except Exception as e:
-                logging.debug(f"Failed to download image {url}: {e}")
+                        shutil.copyfileobj(response.raw, f, COPY_CHUNK_SIZE)
+        except Exception as e:
+            logging.debug(f"Failed to download image {url}: {e}")
+
+    def _outer_html(self) -> str:
+        # one CDP round trip for the serialized document; page_source goes through an extra JS wrapper
+        try:
+            root = self.driver.execute_cdp_cmd("DOM.getDocument", {"depth": 0})["root"]
+            return self.driver.execute_cdp_cmd("DOM.getOuterHTML", {"nodeId": root["nodeId"]})["outerHTML"]
+        except Exception:
+            return self.driver.page_source
 
     def extract_profile(self, profile_url: str, person: Dict[str, Any]) -> Optional[str]:
+        """Save the profile (html, text, images, screenshot) to a folder and return its path."""
         try:
             logging.info(f"Extracting profile: {profile_url}")
             self.driver.get(profile_url)
-            time.sleep(4)
-            safe_name = re.sub(r'[\\/*?:"<>|]', "", person.get("name") or "unknown")
+            try:
+                self._wait(10).until(EC.presence_of_element_located((By.XPATH, "//h1")))
+            except TimeoutException:
+                pass
+            safe_name = _SAFE_NAME_RE.sub("", person.get("name") or "unknown")
             folder = os.path.join(OUTPUT_DIR, safe_name)
             os.makedirs(folder, exist_ok=True)
             self._expand_all_content()
@@ -558,14 +891,16 @@ class FacebookScraper:
                 self.driver.save_screenshot(screenshot_path)
             except Exception:
                 pass
-            page_html = self.driver.page_source
-            with open(os.path.join(folder, "facebook_page.html"), "w", encoding="utf-8") as f:
+            # encode once: the same bytes are written out and parsed, the str copy is dropped right away
+            page_html = self._outer_html().encode("utf-8")
+            with open(os.path.join(folder, "facebook_page.html"), "wb") as f:
                 f.write(page_html)
-            soup = BeautifulSoup(page_html, "html.parser")
-            text_content = soup.get_text(separator="\n", strip=True)
+            tree = HTMLParser(page_html)
+            del page_html
+            self._extract_images(tree, folder, limit=50)
+            # text goes to disk line by line instead of being joined into one large string
             with open(os.path.join(folder, "facebook_page.txt"), "w", encoding="utf-8") as f:
-                f.write(text_content)
-            self._extract_images(soup, folder, limit=50)
+                f.writelines(f"{line}\n" for line in self._visible_lines(tree))
             metadata = {
                 "profileUrl": profile_url,
                 "actualUrl": self.driver.current_url,
@@ -580,7 +915,24 @@ class FacebookScraper:
             logging.error(f"extract_profile error: {e}")
             return None
 
+    def launch_with_cookies(self, cookies: List[Dict[str, Any]]) -> bool:
+        """Launch a browser and log it in by copying another session's cookies."""
+        try:
+            self.launch_browser()
+            self.driver.get("https://www.facebook.com")
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            return True
+        except Exception as e:
+            logging.error(f"Failed to start pooled browser: {e}")
+            self.close()
+            return False
+
     def close(self):
+        self._img_session.close()
         if self.driver:
             try:
                 self.driver.quit()
@@ -588,18 +940,59 @@ class FacebookScraper:
                 pass
             logging.info("Browser closed")
 
+
+class FacebookScraperPool:
+    """Extra Chrome sessions sharing the primary scraper's Facebook login, for parallel page visits."""
+    def __init__(self, primary: FacebookScraper, size: int = SCRAPER_POOL_SIZE):
+        self.primary = primary
+        self.workers: List[FacebookScraper] = []
+        if size <= 1 or primary.driver is None:
+            return
+        cookies = primary.driver.get_cookies()
+        # each worker needs its own user-data-dir, Chrome locks a profile to one process
+        stamp = int(time.time())
+        candidates = [
+            FacebookScraper(user_data_dir=os.path.join(TEMP_DIR, f"chrome_profile_{stamp}_{i}"), use_profile=True,
+                            block_assets=True, headless=True)
+            for i in range(1, size)
+        ]
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            started = list(executor.map(lambda w: w.launch_with_cookies(cookies), candidates))
+        self.workers = [w for w, ok in zip(candidates, started) if ok]
+        logging.info(f"Browser pool ready with {len(self.drivers)} sessions")
+
+    @property
+    def scrapers(self) -> List[FacebookScraper]:
+        return [self.primary] + self.workers
+
+    @property
+    def drivers(self) -> List[webdriver.Chrome]:
+        return [s.driver for s in self.scrapers]
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+
 # =========================================
 # AI SUMMARIZER
 # =========================================
 class ProfileSummarizer:
+    @staticmethod
+    def _compact(text: str) -> str:
+        """Single-space each line and drop blank lines."""
+        return "\n".join(" ".join(line.split()) for line in (text or "").splitlines() if line.strip())
+
     @staticmethod
     def summarize(linkedin_data: Dict, person: Dict, fb_text: str) -> str:
         if not gemini_model:
             logging.warning("Gemini not configured or unavailable. Skipping summarization.")
             return "Summarization unavailable - no API key / gemini_model"
 
-        linkedin_summary = linkedin_data.get("summary_text", "")
-        linkedin_profile = linkedin_data.get("profile_text", "")[:3000]
+        # collapse whitespace runs first so the character limits below cover more actual content
+        linkedin_summary = ProfileSummarizer._compact(linkedin_data.get("summary_text", ""))
+        linkedin_profile = ProfileSummarizer._compact(linkedin_data.get("profile_text", ""))[:3000]
+        fb_text = ProfileSummarizer._compact(fb_text)
 
         prompt = f"""
 Analyze this person's combined LinkedIn and Facebook profiles for identity verification.
@@ -626,11 +1019,11 @@ Generate pure JSON with these fields:
 6. summary
 """
         try:
-            response = gemini_model.generate_content(prompt)
-            summary = response.text.strip()
+            # stream the response so chunks are received as they are generated
+            response = gemini_model.generate_content(prompt, stream=True)
+            summary = "".join(chunk.text for chunk in response).strip()
             # remove markdown fences if any
-            summary = re.sub(r'^```json\s*', '', summary)
-            summary = re.sub(r'```$', '', summary)
+            summary = _MD_FENCE_RE.sub('', summary)
             logging.info("Gemini summary generated")
             return summary
         except Exception as e:
@@ -640,14 +1033,15 @@ Generate pure JSON with these fields:
     @staticmethod
     def save_summary(output_folder: str, summary_text: str):
         try:
-            match = re.search(r'\{.*\}', summary_text, re.DOTALL)
-            if match:
-                summary_json = json.loads(match.group(0))
+            # outermost {...} of the response, located with plain string scans
+            start, end = summary_text.find("{"), summary_text.rfind("}")
+            if start != -1 and end > start:
+                summary_json = json_loads(summary_text[start:end + 1])
             else:
                 summary_json = {"raw_summary": summary_text}
             path = os.path.join(output_folder, "ai_summary.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(summary_json, f, indent=2, ensure_ascii=False)
+            with open(path, "wb") as f:
+                f.write(json_dump_bytes(summary_json))
             logging.info(f"Summary saved to {path}")
         except Exception as e:
             logging.error(f"Failed to save summary: {e}")
@@ -655,117 +1049,245 @@ Generate pure JSON with these fields:
 # =========================================
 # FACIAL MATCHER & SCORER
 # =========================================
+class ProfileCache:
+    """Thread-safe on-disk cache of visited profile pages and face embeddings, keyed by URL."""
+    def __init__(self, path: str = PROFILE_CACHE_PATH, ttl: int = PROFILE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = shelve.open(path)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return url_digest(url)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._db.get(self.key(url))
+        if entry and entry.get("ts", 0) > time.time() - self.ttl:
+            return entry
+        return None
+
+    def update(self, url: str, **fields):
+        with self._lock:
+            key = self.key(url)
+            entry = self._db.get(key) or {}
+            entry.update(fields, ts=time.time())
+            self._db[key] = entry
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class FacialMatcher:
     def __init__(self, face_engine: FaceRecognitionEngine, facebook_scraper: FacebookScraper):
         self.face_engine = face_engine
         self.facebook_scraper = facebook_scraper
+        # LinkedIn photo embeddings by photo URL, kept for the life of the matcher
+        self._linkedin_embs: Dict[str, Optional[np.ndarray]] = {}
 
     @staticmethod
     def fuzzy_ratio(a: str, b: str) -> float:
         if not a or not b:
             return 0.0
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+        return fuzz.ratio(a.lower(), b.lower()) / 100.0
 
-    def score_profiles(self, profiles: List[Dict[str,str]], linkedin_person: Dict[str,Any]) -> List[Dict[str,Any]]:
+    def score_profiles(self, profiles: List[Dict[str,str]], linkedin_person: Dict[str,Any],
+                       drivers: Optional[List[webdriver.Chrome]] = None) -> List[Dict[str,Any]]:
         """
         Score each profile with:
          - Name similarity (20)
          - Location match (20)
          - Company match (10)
          - Face similarity (50)
+        Page visits are spread over `drivers` (defaults to the scraper's own browser).
         """
-        scored = []
-        ln_name = (linkedin_person.get("name") or "").lower()
-        ln_loc = (linkedin_person.get("location") or "").lower()
-        ln_comp = (linkedin_person.get("current_company") or "").lower()
+        # the target is fixed for the whole run: normalise its name / city / company once, up front
+        ln_name = (linkedin_person.get("name") or "").lower().strip()
+        loc_token = (linkedin_person.get("location") or "").lower().split(",")[0].strip()
+        ln_comp = (linkedin_person.get("current_company") or "").lower().strip()
         ln_photo = linkedin_person.get("photo_url")
 
-        # Prepare LinkedIn embedding
-        linkedin_emb = None
+        with ProfileCache() as cache:
+            return self._score_all(cache, profiles, drivers, ln_name, loc_token, ln_comp, ln_photo)
+
+    def _score_all(self, cache: "ProfileCache", profiles: List[Dict[str, str]], drivers: Optional[List[webdriver.Chrome]],
+                   ln_name: str, loc_token: str, ln_comp: str, ln_photo: Optional[str]) -> List[Dict[str, Any]]:
+        # Pages scored recently come from the cache; the rest are visited, sharded across the browser sessions
+        drivers = drivers or [self.facebook_scraper.driver]
+        pages: Dict[str, Tuple[str, Optional[str]]] = {}
+        to_visit = []
+        for p in profiles:
+            cached = cache.get(p.get("url") or "")
+            if cached is not None and "text" in cached:
+                pages[p["url"]] = (cached["text"], cached.get("profile_img"))
+            elif p.get("url"):
+                to_visit.append(p["url"])
+        shards = [to_visit[i::len(drivers)] for i in range(len(drivers))]
+
+        # scoring only reads the DOM and img src attributes; skip the heavy assets while it runs
+        for d in drivers:
+            set_asset_blocking(d, True)
+        try:
+            with tqdm(total=len(to_visit), desc="Visiting profiles", unit="profile") as pbar, \
+                    ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+                for visited in executor.map(lambda args: self._visit_pages(*args, pbar), zip(drivers, shards)):
+                    pages.update(visited)
+        finally:
+            for d in drivers:
+                set_asset_blocking(d, False)
+        for url in to_visit:
+            if url in pages:
+                cache.update(url, text=pages[url][0], profile_img=pages[url][1])
+
+        # Name similarity for every candidate in one rapidfuzz call
+        display_names = [(p.get("name") or "").lower() for p in profiles]
+        name_ratios = process.cdist([ln_name], display_names, scorer=fuzz.ratio, dtype=np.float32)[0] / 100.0
+        if not ln_name:
+            name_ratios[:] = 0.0
+        name_ratios[[not n for n in display_names]] = 0.0
+
+        # Structure of arrays: one slot per candidate, combined with vector ops at the end
+        n = len(profiles)
+        urls = [p.get("url") for p in profiles]
+        visited = np.array([u in pages for u in urls], dtype=bool)
+        texts = [pages[u][0] if u in pages else "" for u in urls]
+        img_urls = [pages[u][1] if u in pages else None for u in urls]
+        # Location match (20): simple token match of first city token; Company match (10)
+        # (page texts are already lowercased in the browser; an empty target never matches)
+        loc_match = np.array([loc_token in t for t in texts] if loc_token else np.zeros(n), dtype=np.float32)
+        co_match = np.array([ln_comp in t for t in texts] if ln_comp else np.zeros(n), dtype=np.float32)
+
+        # Face similarity (50): the LinkedIn photo and every candidate photo are downloaded together
+        # (async), embedded in one batched pass, then compared in one batched cosine kernel call
+        face_sims = np.zeros(n, dtype=np.float32)
         if ln_photo:
-            temp_ln = os.path.join(TEMP_DIR, "linkedin_photo.jpg")
-            try:
-                ok = self.face_engine.download_image(ln_photo, temp_ln)
-                if ok:
-                    linkedin_emb = self.face_engine.get_embedding(temp_ln)
-                else:
-                    logging.debug("Failed to download linkedin photo from URL.")
-                    linkedin_emb = None
-            except Exception:
-                linkedin_emb = None
-
-        # We'll iterate profiles (limit thread concurrency for page loads)
-        for p in tqdm(profiles, desc="Scoring profiles", unit="profile"):
-            url = p.get("url")
-            display_name = p.get("name") or ""
-            score = 0.0
-            # Name similarity (20)
-            name_ratio = self.fuzzy_ratio(ln_name, display_name)
-            score += name_ratio * 20
-
-            # Visit page to inspect textual content and profile image
-            fb_page_text = ""
-            profile_img_url = None
+            face_idx = [i for i in range(n) if visited[i] and img_urls[i]]
+            jobs = [(urls[i], img_urls[i]) for i in face_idx]
+            if ln_photo not in self._linkedin_embs:
+                jobs.append((ln_photo, ln_photo))
+            embs = self._photo_embeddings(cache, jobs)
+            if ln_photo not in self._linkedin_embs:
+                self._linkedin_embs[ln_photo] = embs.pop()
+            linkedin_emb = self._linkedin_embs[ln_photo]
+            if linkedin_emb is None:
+                logging.debug("No usable face in linkedin photo.")
+            else:
+                with_face = [(i, emb) for i, emb in zip(face_idx, embs) if emb is not None]
+                if with_face:
+                    face_sims[[i for i, _ in with_face]] = cosine_batch(linkedin_emb, np.vstack([emb for _, emb in with_face]))
+
+        scores = 20 * name_ratios + 20 * loc_match + 10 * co_match + 50 * face_sims
+        # candidates whose page failed to load are dropped; sort the rest by score
+        keep = np.flatnonzero(visited)
+        order = keep[np.argsort(-scores[keep], kind="stable")]
+        return [{
+            "url": urls[i],
+            "name": profiles[i].get("name") or "",
+            "score": round(float(scores[i]), 2),
+            "name_ratio": round(float(name_ratios[i]), 3),
+            "face_score": round(float(face_sims[i]) * 50, 3),
+            "profile_img": img_urls[i] or ""
+        } for i in order]
+
+    def _visit_pages(self, driver: webdriver.Chrome, urls: List[str], pbar=None) -> Dict[str, Tuple[str, Optional[str]]]:
+        """
+        Read every url in one browser using two tabs: while one tab is being read,
+        the next url is already loading in the other.
+        """
+        pages: Dict[str, Tuple[str, Optional[str]]] = {}
+        if not urls:
+            return pages
+        main_tab = driver.current_window_handle
+        driver.switch_to.new_window("tab")
+        tabs = [main_tab, driver.current_window_handle]
+        try:
+            driver.switch_to.window(main_tab)
+            loaded = True
             try:
-                try:
-                    self.facebook_scraper.driver.get(url)
-                except Exception as e:
-                    logging.debug(f"Failed to load URL {url}: {e}")
-                    continue
-                time.sleep(2.5)
-                fb_page_text = self.facebook_scraper.driver.page_source.lower()
-                # try to find profile image
-                try:
-                    img_el = self.facebook_scraper.driver.find_element(By.XPATH, "//img[contains(@src,'profile') or contains(@src,'scontent') or contains(@src,'cdn')]")
-                    profile_img_url = img_el.get_attribute("src")
-                except Exception:
-                    profile_img_url = None
-            except Exception:
-                fb_page_text = ""
-
-            # Location match (20)
+                driver.get(urls[0])
+            except Exception as e:
+                logging.debug(f"Failed to load URL {urls[0]}: {e}")
+                loaded = False
+            for i, url in enumerate(urls):
+                prefetched = True
+                if i + 1 < len(urls):
+                    # Page.navigate returns once the navigation starts, the load continues in the background
+                    driver.switch_to.window(tabs[(i + 1) % 2])
+                    try:
+                        driver.execute_cdp_cmd("Page.navigate", {"url": urls[i + 1]})
+                    except Exception as e:
+                        logging.debug(f"Failed to load URL {urls[i + 1]}: {e}")
+                        prefetched = False
+                    driver.switch_to.window(tabs[i % 2])
+                if loaded:
+                    pages[url] = self._read_profile_page(driver)
+                loaded = prefetched
+                if pbar is not None:
+                    pbar.update(1)
+        finally:
             try:
-                if ln_loc:
-                    # simple token match of first city token
-                    token = ln_loc.split(",")[0].strip()
-                    if token and token in fb_page_text:
-                        score += 20
+                driver.switch_to.window(tabs[1])
+                driver.close()
+                driver.switch_to.window(main_tab)
             except Exception:
                 pass
+        return pages
 
-            # Company match (10)
+    @staticmethod
+    def _read_profile_page(driver: webdriver.Chrome) -> Tuple[str, Optional[str]]:
+        profile_img_url = None
+        try:
+            # wait for the profile image rather than a fixed delay
             try:
-                if ln_comp and ln_comp in fb_page_text:
-                    score += 10
+                img_el = WebDriverWait(driver, 5, poll_frequency=POLL_FREQUENCY).until(EC.presence_of_element_located(
+                    (By.XPATH, PROFILE_IMG_XPATH)
+                ))
+                profile_img_url = img_el.get_attribute("src")
             except Exception:
-                pass
-
-            # Face similarity (50)
-            face_score = 0.0
-            if linkedin_emb is not None and profile_img_url:
-                try:
-                    temp_fb = os.path.join(TEMP_DIR, f"fb_{hashlib.sha256(url.encode()).hexdigest()[:8]}.jpg")
-                    ok = self.face_engine.download_image(profile_img_url, temp_fb)
-                    if ok:
-                        fb_emb = self.face_engine.get_embedding(temp_fb)
-                        if fb_emb is not None:
-                            sim = self.face_engine.compute_similarity(linkedin_emb, fb_emb)
-                            face_score = sim * 50
-                            score += face_score
-                except Exception:
-                    pass
+                profile_img_url = None
+            # the full markup like page_source (hits in attributes / JSON-LD / hidden nodes count),
+            # lowercased in the browser so Python doesn't make a second copy
+            fb_page_text = driver.execute_script(
+                "return document.documentElement ? document.documentElement.outerHTML.toLowerCase() : ''") or ""
+        except Exception:
+            fb_page_text = ""
+        return fb_page_text, profile_img_url
 
-            scored.append({
-                "url": url,
-                "name": display_name,
-                "score": round(score, 2),
-                "name_ratio": round(name_ratio, 3),
-                "face_score": round(face_score, 3),
-                "profile_img": profile_img_url or ""
-            })
-        # sort
-        scored = sorted(scored, key=lambda x: x["score"], reverse=True)
-        return scored
+    def _photo_embeddings(self, cache: "ProfileCache", jobs: List[Tuple[str, str]]) -> List[Optional[np.ndarray]]:
+        """
+        Face embedding for each (cache key, image url): recent ones come from the cache, the rest are
+        downloaded concurrently, embedded in one batch and stored.
+        """
+        embs: List[Optional[np.ndarray]] = [None] * len(jobs)
+        misses = []
+        for j, (key, _) in enumerate(jobs):
+            entry = cache.get(key)
+            if entry is not None and "emb8" in entry:
+                # int8 values; cosine_batch normalises, so the 1/127 scale can be ignored
+                embs[j] = np.frombuffer(entry["emb8"], dtype=np.int8).astype(np.float32) if entry["emb8"] else None
+            else:
+                misses.append(j)
+        if not misses:
+            return embs
+        try:
+            images = self.face_engine.fetch_images([jobs[j][1] for j in misses])
+            fresh = self.face_engine.get_embeddings_batch(images)
+        except Exception as e:
+            logging.debug(f"Photo embedding failed: {e}")
+            return embs
+        for j, img, emb in zip(misses, images, fresh):
+            embs[j] = emb
+            if img is not None:
+                # b"" remembers that the photo has no usable face
+                cache.update(jobs[j][0], emb8=b"" if emb is None else quantize_embedding(emb).tobytes())
+        return embs
 
 # =========================================
 # ORCHESTRATOR: Full pipeline
@@ -784,6 +1306,13 @@ class ProfileVerificationSystem:
 
     def verify_from_linkedin_data(self, linkedin_dir: str) -> Dict[str,Any]:
         results = {"success": False, "person": {}, "facebook_profile": None, "output_folder": None, "summary": None, "errors": []}
+        pool = None
+        # the browser launch and the face model load don't depend on the LinkedIn data: start both now
+        # so they overlap with STEP 1 and the Facebook login
+        startup = ThreadPoolExecutor(max_workers=2)
+        browser_ready = startup.submit(self.facebook_scraper.launch_browser)
+        face_ready = startup.submit(self.face_engine.initialize)
+        startup.shutdown(wait=False)
         try:
             logging.info("STEP 1: Loading LinkedIn Data")
             linkedin_data = self.linkedin_handler.read_metadata(linkedin_dir)
@@ -796,7 +1325,7 @@ class ProfileVerificationSystem:
             logging.info(f"Target: {person['name']}")
 
             logging.info("STEP 2: Launching browser and logging into Facebook")
-            self.facebook_scraper.launch_browser()
+            browser_ready.result()
             login_ok = self.facebook_scraper.login()
             if not login_ok:
                 results["errors"].append("Facebook login failed")
@@ -812,24 +1341,34 @@ class ProfileVerificationSystem:
                 search_queries.append(f"{person['name']} {person['location'].split(',')[0]}")
             search_queries.append(person['name'])
 
+            # browser pool shared by the searches and the scoring below
+            pool = FacebookScraperPool(self.facebook_scraper)
+            scrapers = pool.scrapers
+
+            def run_query(i_q):
+                i, q = i_q
+                try:
+                    return scrapers[i % len(scrapers)].search_top_profiles(q, limit=30)
+                except Exception as e:
+                    logging.debug(f"search query {q} failed: {e}")
+                    return []
+
+            # run the queries concurrently, one browser each, then merge in preference order
+            with ThreadPoolExecutor(max_workers=min(len(scrapers), len(search_queries))) as executor:
+                found_per_query = list(executor.map(run_query, enumerate(search_queries)))
+
             # gather candidates (deduplicating by url)
             candidates = []
             seen = set()
-            for q in search_queries:
+            for found in found_per_query:
+                for f in found:
+                    url = f.get("url")
+                    if url and url not in seen:
+                        seen.add(url)
+                        candidates.append(f)
                 if len(candidates) >= 30:
                     break
-                try:
-                    found = self.facebook_scraper.search_top_profiles(q, limit=30)
-                    for f in found:
-                        url = f.get("url")
-                        if url and url not in seen:
-                            seen.add(url)
-                            candidates.append(f)
-                            if len(candidates) >= 30:
-                                break
-                except Exception as e:
-                    logging.debug(f"search query {q} failed: {e}")
-                    continue
+            candidates = candidates[:30]
 
             if not candidates:
                 results["errors"].append("No Facebook candidates found")
@@ -840,17 +1379,22 @@ class ProfileVerificationSystem:
 
             # STEP 4: Score candidates
             logging.info("STEP 4: Scoring candidates (name/location/company/face)")
-            # initialize face engine (if available)
-            self.face_engine.initialize()
-            scored = self.facial_matcher.score_profiles(candidates, person)
+            # face engine (if available) was loaded in the background during login and search
+            face_ready.result()
+            try:
+                scored = self.facial_matcher.score_profiles(candidates, person, drivers=pool.drivers)
+            finally:
+                pool.close()
 
             # STEP 5: Display scored list for human selection
-            print("\n" + "="*60)
-            print("CANDIDATE FACEBOOK PROFILES (sorted by score)")
-            print("="*60)
-            for i, s in enumerate(scored, 1):
-                print(f"{i:2d}. Score: {s['score']:6.2f} | Name: {s['name'] or 'N/A'} | FaceScore: {s['face_score']} | {s['url']}")
-            print("\nEnter the number of the profile to scrape (1 - {}), or 0 to abort:".format(len(scored)))
+            lines = ["", "="*60, "CANDIDATE FACEBOOK PROFILES (sorted by score)", "="*60]
+            lines.extend(
+                f"{i:2d}. Score: {s['score']:6.2f} | Name: {s['name'] or 'N/A'} | FaceScore: {s['face_score']} | {s['url']}"
+                for i, s in enumerate(scored, 1)
+            )
+            lines.append("\nEnter the number of the profile to scrape (1 - {}), or 0 to abort:".format(len(scored)))
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
 
             while True:
                 try:
@@ -871,7 +1415,8 @@ class ProfileVerificationSystem:
 
             results["facebook_profile"] = profile_url
 
-            # STEP 6: Scrape selected profile fully
+            # STEP 6: Scrape selected profile fully. The summary needs the whole page (posts and
+            # later sections load during the scroll), so Gemini only runs once the text is saved.
             logging.info("STEP 6: Extracting selected profile")
             output_folder = self.facebook_scraper.extract_profile(profile_url, person)
             if not output_folder:
@@ -908,6 +1453,10 @@ class ProfileVerificationSystem:
             results["errors"].append(str(e))
             return results
         finally:
+            if pool is not None:
+                pool.close()
+            # an early return can get here before the background launch has finished
+            browser_ready.exception()
             try:
                 self.facebook_scraper.close()
             except Exception:
@@ -936,8 +1485,8 @@ class ProfileVerificationSystem:
             if query_emb is None:
                 results["errors"].append("No face found in candidate image")
                 return results
-            # compare
-            out = []
+            # Phase 1: download every profile picture concurrently (async, one pooled client, in memory)
+            jobs = []
             for item in matched:
                 profile = item["profile"]
                 # try to get profile picture url
@@ -949,22 +1498,39 @@ class ProfileVerificationSystem:
                     img_url = ""
                 if not img_url:
                     continue
-                temp_img = os.path.join(TEMP_DIR, f"pr_{hashlib.sha256(img_url.encode()).hexdigest()[:8]}.jpg")
-                ok = self.face_engine.download_image(img_url, temp_img)
-                if not ok:
-                    continue
-                emb = self.face_engine.get_embedding(temp_img)
-                if emb is None:
-                    continue
-                sim = self.face_engine.compute_similarity(query_emb, emb)
-                out.append({
-                    "name": item["name"],
-                    "profile_url": profile.get("publicProfileUrl",""),
-                    "similarity": round(sim, 4)
-                })
-            out = sorted(out, key=lambda x: x["similarity"], reverse=True)
-            results["matches"] = out[:10]
-            results["success"] = len(out) > 0
+                jobs.append((item, img_url))
+            # pictures embedded by an earlier run skip both the download and the model
+            cached = self.face_engine.embedding_cache.get_many([url for _, url in jobs])
+            to_fetch = [url for _, url in jobs if url not in cached]
+            images = self.face_engine.fetch_images(to_fetch)
+            fetched = [(url, img) for url, img in zip(to_fetch, images) if img is not None]
+
+            # Phase 2: one batched embedding pass over the downloaded pictures
+            fresh = self.face_engine.get_embeddings_batch([img for _, img in fetched])
+            fresh_by_url = {url: emb for (url, _), emb in zip(fetched, fresh)}
+            self.face_engine.embedding_cache.put_many(fresh_by_url)
+
+            # everything is scored in int8: cached rows as stored, fresh ones quantized the same way
+            embeddings = [
+                EmbeddingCache.decode(cached[url]) if url in cached
+                else (quantize_embedding(fresh_by_url[url]) if fresh_by_url.get(url) is not None else None)
+                for _, url in jobs
+            ]
+
+            # compare: one batched int8 dot-product kernel call over all embeddings
+            found = [(item, emb) for (item, _), emb in zip(jobs, embeddings) if emb is not None]
+            top = []
+            if found:
+                sims = cosine_batch_int8(quantize_embedding(query_emb), np.vstack([emb for _, emb in found]))
+                for i in np.argsort(-sims)[:10]:
+                    item = found[i][0]
+                    top.append({
+                        "name": item["name"],
+                        "profile_url": item["profile"].get("publicProfileUrl",""),
+                        "similarity": round(float(sims[i]), 4)
+                    })
+            results["matches"] = top
+            results["success"] = len(found) > 0
             # save
             opath = os.path.join(OUTPUT_DIR, "facial_recognition_results.json")
             with open(opath, "w", encoding="utf-8") as f:
@@ -1067,48 +1633,52 @@ def main():
             pass
 
 def print_summary(results: Dict[str,Any]):
-    print("\n" + "="*60)
+    # the whole report is assembled first and written to stdout in one call
+    out = []
+    out.append("\n" + "="*60)
     if not isinstance(results, dict):
-        print("No results")
+        out.append("No results")
+        sys.stdout.write("\n".join(out) + "\n")
         return
     # decide how to print
     if "overall_success" in results:
         status = "✅ SUCCESS" if results["overall_success"] else "⚠️ PARTIAL/FAILED"
-        print(f"Status: {status}")
+        out.append(f"Status: {status}")
         if results.get("linkedin_facebook_verification"):
-            print("LinkedIn/Facebook verification:")
+            out.append("LinkedIn/Facebook verification:")
             lf = results["linkedin_facebook_verification"]
-            print(f"  - success: {lf.get('success')}")
+            out.append(f"  - success: {lf.get('success')}")
             if lf.get("facebook_profile"):
-                print(f"  - Profile: {lf.get('facebook_profile')}")
+                out.append(f"  - Profile: {lf.get('facebook_profile')}")
             if lf.get("output_folder"):
-                print(f"  - Output: {lf.get('output_folder')}")
+                out.append(f"  - Output: {lf.get('output_folder')}")
             if lf.get("errors"):
-                print("  - Errors:")
+                out.append("  - Errors:")
                 for e in lf.get("errors"):
-                    print(f"     * {e}")
+                    out.append(f"     * {e}")
         if results.get("facial_recognition"):
             fr = results["facial_recognition"]
-            print("Facial recognition:")
-            print(f"  - success: {fr.get('success')}")
+            out.append("Facial recognition:")
+            out.append(f"  - success: {fr.get('success')}")
             if fr.get("matches"):
-                print("  - Top matches:")
+                out.append("  - Top matches:")
                 for m in fr.get("matches")[:5]:
-                    print(f"     {m['name']} | {m['similarity']} | {m.get('profile_url')}")
+                    out.append(f"     {m['name']} | {m['similarity']} | {m.get('profile_url')}")
     else:
         status = "✅ SUCCESS" if results.get("success") else "❌ FAILED"
-        print(f"Status: {status}")
+        out.append(f"Status: {status}")
         if results.get("person"):
-            print(f"Person: {results['person'].get('name')}")
+            out.append(f"Person: {results['person'].get('name')}")
         if results.get("facebook_profile"):
-            print(f"Profile: {results.get('facebook_profile')}")
+            out.append(f"Profile: {results.get('facebook_profile')}")
         if results.get("output_folder"):
-            print(f"Output folder: {results.get('output_folder')}")
+            out.append(f"Output folder: {results.get('output_folder')}")
         if results.get("errors"):
-            print("Errors:")
+            out.append("Errors:")
             for e in results.get("errors"):
-                print(f" - {e}")
-    print("="*60 + "\n")
+                out.append(f" - {e}")
+    out.append("="*60 + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
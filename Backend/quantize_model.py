@@ -0,0 +1,83 @@
+import os
+import sys
+import glob
+import shutil
+import logging
+import onnx
+import numpy as np
+from onnxconverter_common import float16
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+from final_facial_embedding import init_face_model, get_face_embedding, compute_similarity
+
+# =========================================
+# REDUCED-PRECISION RECOGNITION MODELS
+# =========================================
+# Builds a copy of buffalo_l under ~/.insightface/models whose recognition
+# model (w600k_r50) runs at lower precision:
+#   int8 -> buffalo_l_int8: dynamic INT8 quantization, for CPUs with VNNI
+#   fp16 -> buffalo_l_fp16: FP16 weights/activations, for GPUs and AVX512-FP16
+# Enable one with FACE_MODEL_NAME=<dir name> once the parity check passes,
+# then rebuild the gallery with build_gallery.py.
+#
+# Usage: python quantize_model.py [int8|fp16] [parity_images_dir]
+
+MODEL_ROOT = os.path.expanduser("~/.insightface/models")
+SRC_MODEL = "buffalo_l"
+DST_MODELS = {"int8": "buffalo_l_int8", "fp16": "buffalo_l_fp16"}
+REC_MODEL_FILE = "w600k_r50.onnx"
+PARITY_IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_images")
+MIN_PARITY_SIMILARITY = 0.98
+
+
+def convert(precision: str = "int8") -> str:
+    src_dir = os.path.join(MODEL_ROOT, SRC_MODEL)
+    dst_dir = os.path.join(MODEL_ROOT, DST_MODELS[precision])
+    if not os.path.exists(os.path.join(src_dir, REC_MODEL_FILE)):
+        # Instantiating the model triggers insightface's download
+        init_face_model(SRC_MODEL)
+
+    os.makedirs(dst_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(src_dir, "*.onnx")):
+        if os.path.basename(path) != REC_MODEL_FILE:
+            shutil.copy2(path, dst_dir)
+
+    src_path = os.path.join(src_dir, REC_MODEL_FILE)
+    dst_path = os.path.join(dst_dir, REC_MODEL_FILE)
+    if precision == "fp16":
+        # insightface feeds float32 blobs, so keep the graph inputs/outputs in FP32
+        model = float16.convert_float_to_float16(onnx.load(src_path), keep_io_types=True)
+        onnx.save(model, dst_path)
+    else:
+        quantize_dynamic(src_path, dst_path, weight_type=QuantType.QInt8)
+    logging.info(f"💾 {precision} model written to {dst_dir}")
+    return dst_dir
+
+
+def check_parity(precision: str = "int8", images_dir: str = PARITY_IMAGES_DIR) -> bool:
+    """Compare FP32 and reduced-precision embeddings of the same faces."""
+    fp32_app = init_face_model(SRC_MODEL)
+    reduced_app = init_face_model(DST_MODELS[precision])
+
+    sims = []
+    for path in glob.glob(os.path.join(images_dir, "**", "*.*"), recursive=True):
+        fp32_emb = get_face_embedding(fp32_app, path)
+        reduced_emb = get_face_embedding(reduced_app, path)
+        if fp32_emb is not None and reduced_emb is not None:
+            sims.append(compute_similarity(fp32_emb, reduced_emb))
+
+    if not sims:
+        logging.error(f"❌ No faces found in {images_dir} to check parity")
+        return False
+
+    logging.info(f"📊 FP32 vs {precision} similarity over {len(sims)} faces: min={min(sims):.4f} mean={np.mean(sims):.4f}")
+    return min(sims) >= MIN_PARITY_SIMILARITY
+
+
+if __name__ == "__main__":
+    precision = sys.argv[1] if len(sys.argv) > 1 else "int8"
+    if precision not in DST_MODELS:
+        print("Usage: python quantize_model.py [int8|fp16] [parity_images_dir]")
+        sys.exit(2)
+    convert(precision)
+    sys.exit(0 if check_parity(precision, *sys.argv[2:3]) else 1)
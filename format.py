@@ -1,51 +1,95 @@
-import pandas as pd
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 # Path to your Excel file
 excel_path = r"C:\Users\jumpi\Downloads\LinkedIn_API_Format.xlsx"
-df = pd.read_excel(excel_path)
-
-profiles = {"elements": []}
-
-for idx, row in df.iterrows():
-
-    # Read values exactly matching your Excel column names
-    profile_id = str(row.get("id", ""))  
-    urn = row.get("urn", "")
-
-    # Safely handle profile picture URL
-    profile_pic_url = row.get("profilepictureurl")
-    if pd.isna(profile_pic_url) or not isinstance(profile_pic_url, str):
-        profile_pic_url = None
-
-    profile = {
-        "id": profile_id,
-        "urn": urn,
-        "localizedFirstName": str(row.get("localisedfirstName", "")),
-        "localizedLastName": str(row.get("localisedLastName", "")),
-        "localizedHeadline": str(row.get("localizedHeadline", "")),
-        "publicProfileUrl": str(row.get("linkedinUrl", "")),
-        "profilePicture": {
-            "displayImage~": {
-                "elements": [
-                    {
-                        "identifiers": [
-                            {
-                                "identifier": profile_pic_url
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-    }
-
-    profiles["elements"].append(profile)
+
+def sheet_rows(path):
+    """
+    Rows of the first sheet as value sequences. calamine (Rust) parses the XLSX without creating
+    a Python object per cell; without it, openpyxl streams the sheet in read-only mode.
+    """
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(path)
+        try:
+            yield from wb.get_sheet_by_index(0).iter_rows()
+        finally:
+            wb.close()
+        return
+
+    from openpyxl import load_workbook
+
+    # Rows come straight from the XML parser as value tuples, without building Cell objects
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+rows = sheet_rows(excel_path)
+header = next(rows, ())
+idx = {name: i for i, name in enumerate(header) if name not in (None, "")}
+
+# Your Excel column names, in output order; their positions are resolved once from the header
+COLUMNS = ["id", "urn", "localisedfirstName", "localisedLastName", "localizedHeadline", "linkedinUrl", "profilepictureurl"]
+positions = [idx.get(name) for name in COLUMNS]
+
+def text(v):
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))  # calamine reads every number as float; keep ids as "123", like openpyxl
+    return str(v)
+
+def texts(row):
+    """The row's COLUMNS cells converted to str in one pass ("" for an empty cell or a missing column)."""
+    return [text(row[i]) if i is not None and i < len(row) else "" for i in positions]
+
+def profile_picture(url):
+    """LinkedIn API profilePicture block; only the identifier varies between profiles."""
+    return {"displayImage~": {"elements": [{"identifiers": [{"identifier": url}]}]}}
+
+def dumps(obj):
+    # orjson encodes straight to UTF-8 bytes (stdlib json is the fallback)
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
 
 # Save JSON output
 json_path = "Backend/profiles.json"
 
-with open(json_path, "w", encoding="utf-8") as f:
-    json.dump(profiles, f, indent=2)
+# Stream {"elements": [...]} one profile per line as rows are read, so memory stays flat
+# however large the sheet is
+count = 0
+with open(json_path, "wb") as f:
+    f.write(b'{"elements": [')
+    for row in rows:
+        if all(v is None or v == "" for v in row):
+            continue  # trailing blank rows (calamine reports empty cells as "")
+
+        profile_id, urn, first_name, last_name, headline, profile_url, profile_pic_url = texts(row)
+
+        f.write(b"\n" if count == 0 else b",\n")
+        f.write(dumps({
+            "id": profile_id,
+            "urn": urn,
+            "localizedFirstName": first_name,
+            "localizedLastName": last_name,
+            "localizedHeadline": headline,
+            "publicProfileUrl": profile_url,
+            # Safely handle profile picture URL
+            "profilePicture": profile_picture(profile_pic_url or None),
+        }))
+        count += 1
+    f.write(b"\n]}\n")
 
-print(f"✅ JSON saved to {json_path}")
+print(f"✅ JSON saved to {json_path} ({count} profiles)")